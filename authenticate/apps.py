@@ -3,3 +3,15 @@ from django.apps import AppConfig
 
 class AuthConfig(AppConfig):
     name = "authenticate"
+
+    def ready(self):
+        import authenticate.signals  # noqa: F401
+        from rest_framework_simplejwt import state
+
+        from authenticate.keys import get_key_ring_backend
+
+        # simplejwt 4 reads its token backend from this module attribute
+        # and has no setting for it
+        backend = get_key_ring_backend()
+        if backend is not None:
+            state.token_backend = backend
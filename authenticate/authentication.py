@@ -0,0 +1,55 @@
+"""Authentication classes for auth api app
+"""
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from authenticate.cache import is_user_active
+from authenticate.revocation import is_revoked
+
+
+class ClaimsUser(TokenUser):
+    """A user backed by the claims AuthTokenObtainPairSerializer adds to
+    its tokens
+    """
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Authenticates requests with the claims of their access token rather
+    than a User loaded from the database
+
+    Revoked tokens are refused. With AUTH_USER_CACHE_TIMEOUT, users that
+    were deactivated or deleted are refused too, noticed within that many
+    seconds.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        if is_revoked(validated_token):
+            raise AuthenticationFailed(
+                _("Token has been revoked"), code="token_revoked"
+            )
+        if settings.AUTH_USER_CACHE_TIMEOUT and not is_user_active(user_id):
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+
+        return ClaimsUser(validated_token)
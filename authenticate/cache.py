@@ -0,0 +1,90 @@
+"""Caches backing stateless authentication: the deny-list of revoked
+tokens and users, and the active state of users
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework_simplejwt.settings import api_settings
+
+DENIED_TOKEN_KEY = "auth:denied:token:%s"
+DENIED_USER_KEY = "auth:denied:user:%s"
+USER_ACTIVE_KEY = "auth:active:%s"
+
+
+def get_cache():
+    return caches[settings.AUTH_CACHE_ALIAS]
+
+
+def get_issued_at(token):
+    """Returns when a token was issued, which simplejwt does not record,
+    from its expiry
+    """
+    return token["exp"] - token.lifetime.total_seconds()
+
+
+def get_denied_token(token):
+    """Returns whether ``token`` is known to be revoked, or None when the
+    deny-list does not know
+    """
+    return get_cache().get(DENIED_TOKEN_KEY % token[api_settings.JTI_CLAIM])
+
+
+def deny_token(token, denied=True, timeout=None):
+    """Records in the deny-list whether ``token`` is revoked, until it
+    expires or for ``timeout`` seconds
+    """
+    remaining = int(token["exp"] - time.time()) + 1
+    if remaining > 0:
+        get_cache().set(
+            DENIED_TOKEN_KEY % token[api_settings.JTI_CLAIM],
+            denied,
+            min(remaining, timeout or remaining),
+        )
+
+
+def deny_user(user_id):
+    """Refuses the tokens issued to a user so far
+    """
+    lifetime = max(
+        api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME
+    )
+    get_cache().set(
+        DENIED_USER_KEY % user_id,
+        time.time(),
+        int(lifetime.total_seconds()) + 1,
+    )
+
+
+def is_user_denied(token):
+    """Returns whether the user of ``token`` was denied after it was issued
+    """
+    denied_at = get_cache().get(
+        DENIED_USER_KEY % token[api_settings.USER_ID_CLAIM]
+    )
+    return denied_at is not None and get_issued_at(token) <= denied_at
+
+
+def is_user_active(user_id):
+    """Returns whether a user exists and is active, loaded at most every
+    AUTH_USER_CACHE_TIMEOUT seconds
+    """
+    cache = get_cache()
+    key = USER_ACTIVE_KEY % user_id
+    active = cache.get(key)
+    if active is None:
+        active = (
+            get_user_model()
+            ._default_manager.filter(
+                **{api_settings.USER_ID_FIELD: user_id, "is_active": True}
+            )
+            .exists()
+        )
+        cache.set(key, active, settings.AUTH_USER_CACHE_TIMEOUT)
+    return active
+
+
+def forget_user(user_id):
+    get_cache().delete(USER_ACTIVE_KEY % user_id)
@@ -0,0 +1,129 @@
+"""Password hashers taking their cost parameters from
+AUTH_PASSWORD_HASHER_COSTS
+"""
+
+import base64
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_noop as _
+
+
+def get_cost(hasher, name, default):
+    """Returns the ``name`` cost parameter of ``hasher``, ``default`` when
+    its algorithm has no entry for it
+    """
+    costs = settings.AUTH_PASSWORD_HASHER_COSTS.get(hasher.algorithm, {})
+    return costs.get(name, default)
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return get_cost(
+            self, "iterations", hashers.PBKDF2PasswordHasher.iterations
+        )
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Needs the argon2-cffi package
+    """
+
+    @property
+    def time_cost(self):
+        return get_cost(
+            self, "time_cost", hashers.Argon2PasswordHasher.time_cost
+        )
+
+    @property
+    def memory_cost(self):
+        return get_cost(
+            self, "memory_cost", hashers.Argon2PasswordHasher.memory_cost
+        )
+
+    @property
+    def parallelism(self):
+        return get_cost(
+            self, "parallelism", hashers.Argon2PasswordHasher.parallelism
+        )
+
+
+class ScryptPasswordHasher(hashers.BasePasswordHasher):
+    """Memory hard hasher of hashlib, encoding passwords like the scrypt
+    hasher of later Django versions
+    """
+
+    algorithm = "scrypt"
+    block_size = 8
+    work_factor = 2 ** 14
+    parallelism = 1
+
+    @property
+    def costs(self):
+        return (
+            get_cost(self, "work_factor", self.work_factor),
+            get_cost(self, "block_size", self.block_size),
+            get_cost(self, "parallelism", self.parallelism),
+        )
+
+    def encode(self, password, salt, costs=None):
+        assert password is not None
+        assert salt and "$" not in salt
+        work_factor, block_size, parallelism = costs or self.costs
+        hash = hashlib.scrypt(
+            password.encode(),
+            salt=salt.encode(),
+            n=work_factor,
+            r=block_size,
+            p=parallelism,
+            # Twice the memory scrypt needs, hashlib allows 32 MiB by default
+            maxmem=256 * work_factor * block_size * parallelism,
+            dklen=64,
+        )
+        return "%s$%d$%s$%d$%d$%s" % (
+            self.algorithm,
+            work_factor,
+            salt,
+            block_size,
+            parallelism,
+            base64.b64encode(hash).decode("ascii"),
+        )
+
+    def decode(self, encoded):
+        algorithm, work_factor, salt, block_size, parallelism, hash = (
+            encoded.split("$", 5)
+        )
+        assert algorithm == self.algorithm
+        return {
+            "costs": (int(work_factor), int(block_size), int(parallelism)),
+            "salt": salt,
+            "hash": hash,
+        }
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        return constant_time_compare(
+            encoded, self.encode(password, decoded["salt"], decoded["costs"])
+        )
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        work_factor, block_size, parallelism = decoded["costs"]
+        return {
+            _("algorithm"): self.algorithm,
+            _("work factor"): work_factor,
+            _("block size"): block_size,
+            _("parallelism"): parallelism,
+            _("salt"): hashers.mask_hash(decoded["salt"]),
+            _("hash"): hashers.mask_hash(decoded["hash"]),
+        }
+
+    def must_update(self, encoded):
+        return self.decode(encoded)["costs"] != self.costs
+
+    def harden_runtime(self, password, encoded):
+        # The cost parameters are part of the hash and not a counter that
+        # can be topped up, like the iterations of PBKDF2
+        pass
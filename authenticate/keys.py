@@ -0,0 +1,179 @@
+"""Asymmetric keys signing the JWTs of auth api app, published as a JWKS so
+other services verify tokens themselves
+"""
+
+import base64
+import hashlib
+import json
+
+import jwt
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.encoding import force_bytes
+from django.utils.translation import gettext_lazy as _
+from jwt.algorithms import has_crypto
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings
+
+if has_crypto:
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+    from cryptography.hazmat.primitives.serialization import (
+        load_pem_private_key,
+        load_pem_public_key,
+    )
+
+
+def encode_integer(value, length=None):
+    """Returns the unpadded base64url encoding of ``value``, big endian
+    """
+    length = length or (value.bit_length() + 7) // 8
+    return (
+        base64.urlsafe_b64encode(value.to_bytes(length, "big"))
+        .rstrip(b"=")
+        .decode("ascii")
+    )
+
+
+class SigningKey:
+    """A parsed RSA or P-256 key, identified by the RFC 7638 thumbprint of
+    its public key
+
+    Keys are parsed once, PyJWT then signs and verifies with the key
+    objects without reading the PEM again.
+    """
+
+    def __init__(self, pem):
+        if not has_crypto:
+            raise ImproperlyConfigured(
+                "The cryptography package is required for JWT keys"
+            )
+
+        data = force_bytes(pem)
+        try:
+            self.private_key = load_pem_private_key(
+                data, None, default_backend()
+            )
+            self.public_key = self.private_key.public_key()
+        except ValueError:
+            self.private_key = None
+            self.public_key = load_pem_public_key(data, default_backend())
+
+        numbers = self.public_key.public_numbers()
+        if isinstance(self.public_key, rsa.RSAPublicKey):
+            self.algorithm = "RS256"
+            members = {
+                "e": encode_integer(numbers.e),
+                "kty": "RSA",
+                "n": encode_integer(numbers.n),
+            }
+        elif isinstance(self.public_key, ec.EllipticCurvePublicKey) and (
+            self.public_key.curve.name == "secp256r1"
+        ):
+            self.algorithm = "ES256"
+            members = {
+                "crv": "P-256",
+                "kty": "EC",
+                "x": encode_integer(numbers.x, 32),
+                "y": encode_integer(numbers.y, 32),
+            }
+        else:
+            raise ImproperlyConfigured("JWT keys must be RSA or P-256 keys")
+
+        self.kid = (
+            base64.urlsafe_b64encode(
+                hashlib.sha256(
+                    json.dumps(
+                        members, sort_keys=True, separators=(",", ":")
+                    ).encode("ascii")
+                ).digest()
+            )
+            .rstrip(b"=")
+            .decode("ascii")
+        )
+        self.jwk = {
+            **members,
+            "kid": self.kid,
+            "alg": self.algorithm,
+            "use": "sig",
+        }
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "rb") as key_file:
+            return cls(key_file.read())
+
+
+class KeyRingBackend(TokenBackend):
+    """Signs tokens with the first of ``keys``, naming it in the ``kid``
+    header, and verifies them with the key they name
+
+    Rotating keys takes publishing the next key after the current one,
+    waiting for the JWKS caches of other services to expire, then moving it
+    first. The previous key stays last until its tokens have expired.
+    """
+
+    def __init__(self, keys, audience=None, issuer=None):
+        # TokenBackend.__init__ only allows the algorithms of simplejwt,
+        # which do not include ES256
+        if not keys or keys[0].private_key is None:
+            raise ImproperlyConfigured(
+                "The first JWT key must be a private key"
+            )
+
+        self.keys = {key.kid: key for key in keys}
+        self.current_key = keys[0]
+        self.algorithm = self.current_key.algorithm
+        self.signing_key = self.current_key.private_key
+        self.verifying_key = None
+        self.audience = audience
+        self.issuer = issuer
+        self.jwks = {"keys": [key.jwk for key in keys]}
+
+    def encode(self, payload):
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload["aud"] = self.audience
+        if self.issuer is not None:
+            jwt_payload["iss"] = self.issuer
+
+        token = jwt.encode(
+            jwt_payload,
+            self.signing_key,
+            algorithm=self.algorithm,
+            headers={"kid": self.current_key.kid},
+        )
+        return token.decode("utf-8")
+
+    def decode(self, token, verify=True):
+        try:
+            key = self.keys.get(jwt.get_unverified_header(token).get("kid"))
+            if key is None and verify:
+                raise TokenBackendError(
+                    _("Token is signed with an unknown key")
+                )
+            return jwt.decode(
+                token,
+                key and key.public_key,
+                algorithms=[key.algorithm] if key else None,
+                verify=verify,
+                audience=self.audience,
+                issuer=self.issuer,
+                options={"verify_aud": self.audience is not None},
+            )
+        except jwt.InvalidTokenError:
+            raise TokenBackendError(_("Token is invalid or expired"))
+
+
+def get_key_ring_backend():
+    """Returns a KeyRingBackend of the AUTH_JWT_KEY_FILES, or None when no
+    keys are configured
+    """
+    if not settings.AUTH_JWT_KEY_FILES:
+        return None
+    return KeyRingBackend(
+        [SigningKey.from_file(path) for path in settings.AUTH_JWT_KEY_FILES],
+        audience=api_settings.AUDIENCE,
+        issuer=api_settings.ISSUER,
+    )
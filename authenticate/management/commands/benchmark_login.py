@@ -0,0 +1,116 @@
+"""Benchmarks logins with each password hasher
+"""
+
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from sor.benchmarks import (
+    BenchmarkError,
+    get_percentile,
+    measure,
+    scratch_database,
+)
+
+
+def parse_cost(value):
+    name, _, number = value.partition("=")
+    if not number.isdigit():
+        raise ValueError(value)
+    return name, int(number)
+
+
+class Command(BaseCommand):
+    help = (
+        "Logs in through the token endpoint with passwords of each hasher "
+        "and reports the logins per second and core they allow, to choose "
+        "AUTH_PASSWORD_HASHER and AUTH_PASSWORD_HASHER_COSTS"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hasher",
+            action="append",
+            dest="hashers",
+            choices=list(settings.PASSWORD_HASHER_CLASSES),
+            help="Hasher to benchmark, may be repeated (all)",
+        )
+        parser.add_argument(
+            "--cost",
+            action="append",
+            type=parse_cost,
+            default=[],
+            help="Cost parameter as name=value, e.g. work_factor=32768",
+        )
+        parser.add_argument("--logins", type=int, default=20)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            "%-14s %9s %9s %14s  %s"
+            % ("hasher", "p50 ms", "p95 ms", "logins/s/core", "costs")
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            for algorithm in (
+                options["hashers"] or settings.PASSWORD_HASHER_CLASSES
+            ):
+                costs = {
+                    **settings.AUTH_PASSWORD_HASHER_COSTS.get(algorithm, {}),
+                    **dict(options["cost"]),
+                }
+                with override_settings(
+                    PASSWORD_HASHERS=[
+                        settings.PASSWORD_HASHER_CLASSES[algorithm]
+                    ],
+                    AUTH_PASSWORD_HASHER_COSTS={algorithm: costs},
+                ):
+                    try:
+                        get_hasher().encode("password", "salt")
+                    except ValueError as error:
+                        self.stdout.write("%-14s %s" % (algorithm, error))
+                        continue
+
+                    path = os.path.join(directory, "%s.sqlite3" % algorithm)
+                    try:
+                        with scratch_database(path):
+                            result = self.benchmark(options["logins"])
+                    except BenchmarkError as error:
+                        raise CommandError(error)
+
+                self.stdout.write(
+                    "%-14s %9.1f %9.1f %14.1f  %s"
+                    % (
+                        algorithm,
+                        result["p50_ms"],
+                        result["p95_ms"],
+                        result["logins_per_second"],
+                        " ".join(
+                            "%s=%s" % item for item in sorted(costs.items())
+                        ),
+                    )
+                )
+
+    def benchmark(self, logins):
+        User.objects.create_user("benchmark", password="password")
+        client = APIClient(HTTP_HOST="localhost")
+        url = reverse("token_obtain_pair")
+        data = {"username": "benchmark", "password": "password"}
+
+        timings = []
+        start = time.process_time()
+        for _ in range(logins):
+            timings.append(measure(client, "post", url, data)[0] * 1000)
+        cpu_seconds = time.process_time() - start
+
+        return {
+            "p50_ms": get_percentile(timings, 50),
+            "p95_ms": get_percentile(timings, 95),
+            "logins_per_second": logins / cpu_seconds,
+        }
@@ -0,0 +1,85 @@
+"""Benchmarks the middleware overhead of api requests
+"""
+
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from sor.benchmarks import (
+    BenchmarkError,
+    get_percentile,
+    measure,
+    scratch_database,
+)
+from sor.models import Label
+
+# MIDDLEWARE before authenticate.middleware, for comparison
+BASELINE_MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "sor.middleware.PrimaryPinningMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Lists labels without middleware, with the baseline MIDDLEWARE and "
+        "with the configured one, and reports the time the middleware adds "
+        "to each request"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        modes = [
+            ("none", []),
+            ("baseline", BASELINE_MIDDLEWARE),
+            ("configured", settings.MIDDLEWARE),
+        ]
+        url = reverse("label-list")
+
+        with tempfile.TemporaryDirectory() as directory:
+            with scratch_database(os.path.join(directory, "db.sqlite3")):
+                Label.objects.bulk_create(
+                    Label(name="label%d" % index) for index in range(20)
+                )
+                # Clients load their middleware on their first request, and
+                # take turns so drift affects every mode alike
+                clients = {}
+                for name, middleware in modes:
+                    with override_settings(MIDDLEWARE=middleware):
+                        clients[name] = APIClient(HTTP_HOST="localhost")
+                        measure(clients[name], "get", url)
+
+                timings = {name: [] for name, _ in modes}
+                try:
+                    for _ in range(options["requests"]):
+                        for name, client in clients.items():
+                            timings[name].append(
+                                measure(client, "get", url)[0] * 1000000
+                            )
+                except BenchmarkError as error:
+                    raise CommandError(error)
+
+        floor = get_percentile(timings["none"], 50)
+        self.stdout.write(
+            "%-11s %9s %9s %12s"
+            % ("middleware", "p50 us", "p95 us", "overhead us")
+        )
+        for name, _ in modes:
+            p50 = get_percentile(timings[name], 50)
+            self.stdout.write(
+                "%-11s %9.0f %9.0f %12.0f"
+                % (name, p50, get_percentile(timings[name], 95), p50 - floor)
+            )
@@ -0,0 +1,143 @@
+"""Benchmarks token refreshes against a large revocation store
+"""
+
+import datetime
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from authenticate.models import RevokedToken
+from authenticate.revocation import revocation_store
+from authenticate.serializers import AuthTokenObtainPairSerializer
+from sor.benchmarks import (
+    BenchmarkError,
+    get_percentile,
+    measure,
+    scratch_database,
+)
+
+# The deny-list cache is disabled by the benchmark databases, so without the
+# bloom filter every refresh queries the store, like simplejwt's blacklist
+MODES = [
+    ("database", {"AUTH_REVOCATION_BLOOM_BITS": 0}),
+    ("bloom filter", {}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Refreshes tokens on a scratch SQLite database holding --revoked "
+        "revoked tokens, with and without the bloom filter, and reports "
+        "latency, queries and concurrent throughput"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--revoked", type=int, default=100000)
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Refreshes measured one at a time",
+        )
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=5.0,
+            help="Seconds the threads refresh tokens for",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            "%-13s %9s %9s %8s %11s"
+            % ("mode", "p50 ms", "p95 ms", "queries", "refreshes/s")
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            for name, overrides in MODES:
+                path = os.path.join(
+                    directory, "%s.sqlite3" % name.replace(" ", "_")
+                )
+                try:
+                    with scratch_database(path), override_settings(
+                        **overrides
+                    ):
+                        revocation_store.invalidate()
+                        result = self.benchmark(**options)
+                except BenchmarkError as error:
+                    raise CommandError(error)
+                finally:
+                    revocation_store.invalidate()
+
+                self.stdout.write(
+                    "%-13s %9.1f %9.1f %8d %11.1f"
+                    % (
+                        name,
+                        result["p50_ms"],
+                        result["p95_ms"],
+                        result["queries"],
+                        result["throughput"],
+                    )
+                )
+
+    def seed(self, revoked):
+        expires_at = timezone.now() + datetime.timedelta(days=1)
+        RevokedToken.objects.bulk_create(
+            RevokedToken(jti=uuid.uuid4().hex, expires_at=expires_at)
+            for _ in range(revoked)
+        )
+        user = User.objects.create_user("benchmark")
+        return str(AuthTokenObtainPairSerializer.get_token(user))
+
+    def benchmark(self, revoked, requests, threads, duration, **options):
+        refresh = self.seed(revoked)
+        url = reverse("token_refresh")
+        client = APIClient(HTTP_HOST="localhost")
+
+        # Builds the bloom filter beforehand
+        measure(client, "post", url, {"refresh": refresh})
+        samples = [
+            measure(client, "post", url, {"refresh": refresh})
+            for _ in range(requests)
+        ]
+        timings = [sample[0] * 1000 for sample in samples]
+        connection.close()
+
+        counts = []
+        deadline = time.monotonic() + duration
+
+        def work():
+            thread_client = APIClient(HTTP_HOST="localhost")
+            done = 0
+            try:
+                while time.monotonic() < deadline:
+                    response = thread_client.post(
+                        url, {"refresh": refresh}, format="json"
+                    )
+                    if response.status_code == 200:
+                        done += 1
+            finally:
+                connection.close()
+            counts.append(done)
+
+        workers = [threading.Thread(target=work) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        return {
+            "p50_ms": get_percentile(timings, 50),
+            "p95_ms": get_percentile(timings, 95),
+            "queries": max(sample[1] for sample in samples),
+            "throughput": sum(counts) / duration,
+        }
@@ -0,0 +1,17 @@
+"""Deletes the revoked tokens that have expired
+"""
+
+from django.core.management.base import BaseCommand
+
+from authenticate.revocation import revocation_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes the revoked tokens past their expiry, which are refused "
+        "anyway, to be run periodically e.g. from cron"
+    )
+
+    def handle(self, *args, **options):
+        deleted = revocation_store.compact()
+        self.stdout.write("Deleted %d expired revoked tokens" % deleted)
@@ -0,0 +1,39 @@
+"""Generates a private key to sign JWTs with
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from jwt.algorithms import has_crypto
+
+if has_crypto:
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes a new PEM private key to add to AUTH_JWT_KEY_FILES, RSA for "
+        "RS256 or P-256 for ES256"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--algorithm", choices=["RS256", "ES256"], default="ES256"
+        )
+
+    def handle(self, *args, **options):
+        if not has_crypto:
+            raise CommandError("The cryptography package is required")
+
+        if options["algorithm"] == "RS256":
+            key = rsa.generate_private_key(65537, 2048, default_backend())
+        else:
+            key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+        self.stdout.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            ).decode("ascii"),
+            ending="",
+        )
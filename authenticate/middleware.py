@@ -0,0 +1,47 @@
+"""Middleware for auth api app
+
+The API is authenticated with JWTs, so the session, CSRF, authentication
+and message middleware only run for the pages of the site. They are
+subclassed rather than dropped from MIDDLEWARE, which the admin checks.
+"""
+
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.middleware import csrf
+
+
+def is_api_request(request):
+    return request.path_info.startswith(settings.API_PATH_PREFIX)
+
+
+class SiteOnlyMiddlewareMixin:
+    """Passes API requests straight to the next middleware
+    """
+
+    def __call__(self, request):
+        if is_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(SiteOnlyMiddlewareMixin, sessions.SessionMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(SiteOnlyMiddlewareMixin, csrf.CsrfViewMiddleware):
+    def process_view(self, request, *args, **kwargs):
+        if is_api_request(request):
+            return None
+        return super().process_view(request, *args, **kwargs)
+
+
+class AuthenticationMiddleware(
+    SiteOnlyMiddlewareMixin, auth.AuthenticationMiddleware
+):
+    pass
+
+
+class MessageMiddleware(SiteOnlyMiddlewareMixin, messages.MessageMiddleware):
+    pass
@@ -1,3 +1,20 @@
+"""Models for auth api app
+"""
+
 from django.db import models
 
-# Create your models here.
+
+class RevokedToken(models.Model):
+    """Records a revoked token until it expires
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = "Revoked Token"
+        verbose_name_plural = "Revoked Tokens"
+
+    def __str__(self):
+        return self.jti
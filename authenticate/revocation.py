@@ -0,0 +1,151 @@
+"""Revocation store of the tokens of auth api app
+"""
+
+import datetime
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from authenticate.cache import deny_token, get_denied_token, is_user_denied
+from authenticate.models import RevokedToken
+
+
+class BloomFilter:
+    """Set of strings in ``bits`` bits, which may answer that a string it
+    does not hold is in it but never the other way around
+    """
+
+    def __init__(self, bits, hashes):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = bytearray((bits + 7) // 8)
+
+    def get_positions(self, item):
+        # Double hashing derives every position from one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return [
+            (first + index * step) % self.bits for index in range(self.hashes)
+        ]
+
+    def add(self, item):
+        for position in self.get_positions(item):
+            self._array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(
+            self._array[position >> 3] & 1 << (position & 7)
+            for position in self.get_positions(item)
+        )
+
+
+class RevocationStore:
+    """Answers whether a token is revoked, mostly without leaving the process
+
+    A bloom filter of the revoked jtis rules out most tokens. It takes the
+    rows other processes revoke every ``AUTH_REVOCATION_SYNC_SECONDS`` and
+    is rebuilt every ``AUTH_REVOCATION_REBUILD_SECONDS`` to drop compacted
+    rows. The tokens it can not rule out are looked up in the deny-list
+    cache, then in the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._built_at = self._synced_at = 0
+        self._synced_since = None
+
+    def invalidate(self):
+        with self._lock:
+            self._filter = None
+
+    def get_filter(self):
+        """Returns the bloom filter, up to date with the database as of
+        ``AUTH_REVOCATION_SYNC_SECONDS`` ago, or None when disabled
+        """
+        if not settings.AUTH_REVOCATION_BLOOM_BITS:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            if (
+                self._filter is None
+                or now - self._built_at
+                > settings.AUTH_REVOCATION_REBUILD_SECONDS
+            ):
+                self._filter = BloomFilter(
+                    settings.AUTH_REVOCATION_BLOOM_BITS,
+                    settings.AUTH_REVOCATION_BLOOM_HASHES,
+                )
+                self._built_at = self._synced_at = now
+                self._synced_since = timezone.now()
+                rows = RevokedToken.objects.filter(
+                    expires_at__gt=self._synced_since
+                )
+            elif now - self._synced_at > settings.AUTH_REVOCATION_SYNC_SECONDS:
+                # Rows revoked while the last sync ran are read again
+                since = self._synced_since - datetime.timedelta(
+                    seconds=settings.AUTH_REVOCATION_SYNC_SECONDS
+                )
+                self._synced_at = now
+                self._synced_since = timezone.now()
+                rows = RevokedToken.objects.filter(revoked_at__gte=since)
+            else:
+                return self._filter
+
+            for jti in rows.values_list("jti", flat=True).iterator():
+                self._filter.add(jti)
+            return self._filter
+
+    def is_revoked(self, token):
+        jti = token[api_settings.JTI_CLAIM]
+        bloom_filter = self.get_filter()
+        if bloom_filter is not None and jti not in bloom_filter:
+            return False
+
+        revoked = get_denied_token(token)
+        if revoked is None:
+            revoked = RevokedToken.objects.filter(jti=jti).exists()
+            deny_token(
+                token,
+                revoked,
+                None if revoked else settings.AUTH_REVOCATION_SYNC_SECONDS,
+            )
+        return revoked
+
+    def revoke(self, token):
+        jti = token[api_settings.JTI_CLAIM]
+        RevokedToken.objects.get_or_create(
+            jti=jti,
+            defaults={
+                "expires_at": datetime.datetime.fromtimestamp(
+                    token["exp"], datetime.timezone.utc
+                )
+            },
+        )
+        deny_token(token)
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def compact(self):
+        """Deletes the rows of expired tokens and returns how many
+        """
+        deleted, _ = RevokedToken.objects.filter(
+            expires_at__lte=timezone.now()
+        ).delete()
+        return deleted
+
+
+revocation_store = RevocationStore()
+
+
+def is_revoked(token):
+    """Returns whether ``token``, or every token of its user, was revoked
+    """
+    return is_user_denied(token) or revocation_store.is_revoked(token)
@@ -1,7 +1,17 @@
 """Serializers for auth api app
 """
 
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
+
+from authenticate.revocation import is_revoked, revocation_store
 
 
 class AuthTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -26,3 +36,31 @@ class AuthTokenObtainPairSerializer(TokenObtainPairSerializer):
             "access": access,
         }
         return data
+
+
+class AuthTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs["refresh"])
+        if is_revoked(refresh):
+            raise InvalidToken(_("Token has been revoked"))
+
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                revocation_store.revoke(refresh)
+
+            refresh.set_jti()
+            refresh.set_exp()
+
+            data["refresh"] = str(refresh)
+
+        return data
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    token = serializers.CharField()
+
+    def validate(self, attrs):
+        revocation_store.revoke(UntypedToken(attrs["token"]))
+        return {}
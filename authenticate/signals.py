@@ -0,0 +1,23 @@
+"""Signals for auth api app
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from rest_framework_simplejwt.settings import api_settings
+
+from authenticate.cache import deny_user, forget_user
+
+
+def revoke_user_tokens(sender, instance, **kwargs):
+    user_id = getattr(instance, api_settings.USER_ID_FIELD)
+    forget_user(user_id)
+    if not instance.is_active or kwargs.get("signal") is post_delete:
+        deny_user(user_id)
+
+
+for signal in (post_save, post_delete):
+    signal.connect(
+        revoke_user_tokens,
+        sender=get_user_model(),
+        dispatch_uid="auth_revoke_user_tokens",
+    )
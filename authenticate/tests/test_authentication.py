@@ -0,0 +1,83 @@
+"""Test Cases for auth api authentication
+"""
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authenticate.authentication import ClaimsUser
+from authenticate.cache import get_cache
+from authenticate.revocation import revocation_store
+from authenticate.serializers import AuthTokenObtainPairSerializer
+from authenticate.tests.utils import APIViewTestCase
+
+
+class TestStatelessJWTAuthentication(APIViewTestCase):
+    """Tests for Stateless JWT Authentication
+    """
+    view_name = "label-list"
+
+    def setUp(self):
+        get_cache().clear()
+        self.addCleanup(get_cache().clear)
+        self.user = User.objects.create_user(
+            username="test_username", email="test@example.com"
+        )
+        self.token = AuthTokenObtainPairSerializer.get_token(
+            self.user
+        ).access_token
+        self.authenticate_with_token("Bearer", self.token)
+
+    def get_user_queries(self, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            result = self.view_post(data={"name": "label"}, **kwargs)
+        self.assertEqual(result.status_code, 201)
+        return [
+            query["sql"] for query in queries if '"auth_user"' in query["sql"]
+        ]
+
+    def test_it_should_authenticate_from_claims(self):
+        """Only the first request checks the user is active
+        """
+        result = self.view_get()
+        self.assertEqual(result.status_code, 200)
+        user = result.wsgi_request.user
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(user.username, "test_username")
+        self.assertEqual(user.email, "test@example.com")
+
+        self.assertEqual(self.get_user_queries(), [])
+
+    def test_it_should_not_query_users_without_user_cache(self):
+        with self.settings(AUTH_USER_CACHE_TIMEOUT=0):
+            self.assertEqual(self.get_user_queries(), [])
+
+    def test_it_should_return_401_if_token_revoked(self):
+        revocation_store.revoke(AccessToken(str(self.token)))
+        result = self.view_get()
+        self.assertEqual(result.status_code, 401)
+        self.assertEqual(result.data["code"], "token_revoked")
+
+        other = AuthTokenObtainPairSerializer.get_token(self.user)
+        self.authenticate_with_token("Bearer", other.access_token)
+        self.assertEqual(self.view_get().status_code, 200)
+
+    def test_it_should_return_401_if_user_deactivated(self):
+        self.assertEqual(self.view_get().status_code, 200)
+
+        self.user.is_active = False
+        self.user.save()
+        result = self.view_get()
+        self.assertEqual(result.status_code, 401)
+        self.assertEqual(result.data["code"], "token_revoked")
+
+        # Without the deny-list, the user cache notices it
+        get_cache().clear()
+        result = self.view_get()
+        self.assertEqual(result.status_code, 401)
+        self.assertEqual(result.data["code"], "user_inactive")
+
+    def test_it_should_return_401_if_user_deleted(self):
+        self.user.delete()
+        self.assertEqual(self.view_get().status_code, 401)
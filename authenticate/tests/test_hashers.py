@@ -0,0 +1,76 @@
+"""Test Cases for auth api password hashers
+"""
+from django.contrib.auth.hashers import (
+    check_password,
+    get_hasher,
+    identify_hasher,
+    make_password,
+)
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from authenticate.tests.utils import APIViewTestCase
+
+# Cheap costs keep the tests fast
+TEST_COSTS = {
+    "scrypt": {"work_factor": 2 ** 4, "block_size": 8, "parallelism": 1},
+    "pbkdf2_sha256": {"iterations": 1000},
+}
+
+
+@override_settings(AUTH_PASSWORD_HASHER_COSTS=TEST_COSTS)
+class TestScryptPasswordHasher(TestCase):
+    """Tests for Scrypt Password Hasher
+    """
+
+    def test_it_should_verify_passwords(self):
+        encoded = make_password("password", "salt", "scrypt")
+        self.assertTrue(encoded.startswith("scrypt$16$salt$8$1$"))
+        self.assertTrue(check_password("password", encoded))
+        self.assertFalse(check_password("wrong", encoded))
+
+    def test_it_should_update_passwords_of_other_costs(self):
+        hasher = get_hasher("scrypt")
+        encoded = hasher.encode("password", "salt")
+        self.assertFalse(hasher.must_update(encoded))
+
+        costs = {"scrypt": {**TEST_COSTS["scrypt"], "work_factor": 2 ** 5}}
+        with self.settings(AUTH_PASSWORD_HASHER_COSTS=costs):
+            self.assertTrue(hasher.must_update(encoded))
+            self.assertTrue(check_password("password", encoded))
+
+    def test_it_should_read_pbkdf2_iterations(self):
+        encoded = make_password("password", "salt", "pbkdf2_sha256")
+        self.assertTrue(encoded.startswith("pbkdf2_sha256$1000$salt$"))
+
+
+@override_settings(AUTH_PASSWORD_HASHER_COSTS=TEST_COSTS)
+class TestRehashOnLogin(APIViewTestCase):
+    """Tests for rehashing passwords on login
+    """
+    view_name = "token_obtain_pair"
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="test_username")
+        self.user.password = make_password(
+            "test_password", hasher="pbkdf2_sha256"
+        )
+        self.user.save()
+
+    def login(self):
+        result = self.view_post(
+            data={"username": "test_username", "password": "test_password"}
+        )
+        self.assertEqual(result.status_code, 200)
+        self.user.refresh_from_db()
+        return identify_hasher(self.user.password)
+
+    def test_it_should_rehash_with_preferred_hasher(self):
+        self.assertEqual(self.login().algorithm, "scrypt")
+
+    def test_it_should_rehash_with_new_costs(self):
+        self.login()
+        costs = {"scrypt": {**TEST_COSTS["scrypt"], "work_factor": 2 ** 5}}
+        with self.settings(AUTH_PASSWORD_HASHER_COSTS=costs):
+            self.login()
+        self.assertTrue(self.user.password.startswith("scrypt$32$"))
@@ -0,0 +1,130 @@
+"""Test Cases for auth api signing keys
+"""
+import os
+import tempfile
+from io import StringIO
+from unittest import mock, skipUnless
+
+import jwt
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase
+from jwt.algorithms import has_crypto
+from rest_framework_simplejwt import state
+from rest_framework_simplejwt.exceptions import TokenBackendError
+
+from authenticate.cache import get_cache
+from authenticate.keys import KeyRingBackend, SigningKey, get_key_ring_backend
+from authenticate.tests.utils import APIViewTestCase
+
+if has_crypto:
+    from cryptography.hazmat.primitives import serialization
+
+
+def generate_key(algorithm):
+    out = StringIO()
+    call_command("generate_jwt_key", algorithm=algorithm, stdout=out)
+    return out.getvalue()
+
+
+@skipUnless(has_crypto, "cryptography is not installed")
+class TestKeyRingBackend(TestCase):
+    """Tests for Key Ring Backend
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.rsa_pem = generate_key("RS256")
+        cls.ec_pem = generate_key("ES256")
+
+    def test_it_should_identify_keys_by_thumbprint(self):
+        rsa_key = SigningKey(self.rsa_pem)
+        self.assertEqual(rsa_key.algorithm, "RS256")
+        self.assertEqual(
+            set(rsa_key.jwk), {"kty", "n", "e", "kid", "alg", "use"}
+        )
+
+        ec_key = SigningKey(self.ec_pem)
+        self.assertEqual(ec_key.algorithm, "ES256")
+        self.assertEqual(ec_key.jwk["crv"], "P-256")
+        self.assertNotEqual(ec_key.kid, rsa_key.kid)
+
+        # The public key alone has the same identity
+        public_key = SigningKey(
+            ec_key.public_key.public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+        )
+        self.assertIsNone(public_key.private_key)
+        self.assertEqual(public_key.jwk, ec_key.jwk)
+
+        with self.assertRaises(ImproperlyConfigured):
+            KeyRingBackend([public_key])
+
+    def test_it_should_verify_tokens_of_rotated_keys(self):
+        old_key, new_key = SigningKey(self.rsa_pem), SigningKey(self.ec_pem)
+        token = KeyRingBackend([old_key]).encode({"user_id": 1})
+        self.assertEqual(jwt.get_unverified_header(token)["kid"], old_key.kid)
+
+        backend = KeyRingBackend([new_key, old_key])
+        self.assertEqual(backend.decode(token), {"user_id": 1})
+        self.assertEqual(
+            jwt.get_unverified_header(backend.encode({"user_id": 1})),
+            {"typ": "JWT", "alg": "ES256", "kid": new_key.kid},
+        )
+
+        with self.assertRaises(TokenBackendError):
+            KeyRingBackend([new_key]).decode(token)
+
+    def test_it_should_load_key_files(self):
+        self.assertIsNone(get_key_ring_backend())
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for name, pem in (("new", self.ec_pem), ("old", self.rsa_pem)):
+                paths.append(os.path.join(directory, name))
+                with open(paths[-1], "w") as key_file:
+                    key_file.write(pem)
+
+            with self.settings(AUTH_JWT_KEY_FILES=paths):
+                backend = get_key_ring_backend()
+        self.assertEqual(backend.algorithm, "ES256")
+        self.assertEqual(len(backend.jwks["keys"]), 2)
+
+
+class TestJWKSView(APIViewTestCase):
+    """Tests for JSON Web Key Set View
+    """
+    view_name = "jwks"
+
+    def setUp(self):
+        get_cache().clear()
+
+    def test_it_should_publish_no_keys_without_key_files(self):
+        result = self.view_get()
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(result.json(), {"keys": []})
+        self.assertIn("max-age=300", result["Cache-Control"])
+
+    @skipUnless(has_crypto, "cryptography is not installed")
+    def test_it_should_publish_public_keys(self):
+        key = SigningKey(generate_key("ES256"))
+        with mock.patch.object(state, "token_backend", KeyRingBackend([key])):
+            result = self.view_get()
+            self.assertEqual(result.json(), {"keys": [key.jwk]})
+
+            User.objects.create_user(username="test", password="test")
+            self.view_name = "token_obtain_pair"
+            result = self.view_post(
+                data={"username": "test", "password": "test"}
+            )
+            access = result.data["user"]["access"]
+            self.assertEqual(jwt.get_unverified_header(access)["alg"], "ES256")
+
+            self.view_name = "label-list"
+            self.authenticate_with_token("Bearer", access)
+            result = self.view_post(data={"name": "label"})
+            self.assertEqual(result.status_code, 201)
@@ -0,0 +1,31 @@
+"""Test cases for the site middleware skipped by api requests
+"""
+
+from django.test import TestCase
+from django.urls import reverse
+
+
+class SiteOnlyMiddlewareTestCase(TestCase):
+    def test_api_requests_skip_site_middleware(self):
+        response = self.client.get(reverse("jwks"))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(hasattr(response.wsgi_request, "session"))
+        self.assertFalse(hasattr(response.wsgi_request, "_messages"))
+        self.assertNotIn("Cookie", response.get("Vary", ""))
+        self.assertEqual(response["X-Frame-Options"], "DENY")
+
+    def test_site_requests_run_site_middleware(self):
+        response = self.client.get(reverse("admin:login"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(hasattr(response.wsgi_request, "session"))
+        self.assertTrue(hasattr(response.wsgi_request, "_messages"))
+        self.assertIn("csrftoken", response.cookies)
+
+        self.client.handler.enforce_csrf_checks = True
+        response = self.client.post(reverse("admin:login"))
+        self.assertEqual(response.status_code, 403)
+
+    def test_api_writes_skip_csrf_checks(self):
+        self.client.handler.enforce_csrf_checks = True
+        response = self.client.post(reverse("token_obtain_pair"))
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,132 @@
+"""Test Cases for auth api token revocation
+"""
+import datetime
+import uuid
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authenticate.cache import get_cache
+from authenticate.models import RevokedToken
+from authenticate.revocation import BloomFilter, revocation_store
+from authenticate.tests.utils import APIViewTestCase
+
+
+class TestBloomFilter(TestCase):
+    """Tests for Bloom Filter
+    """
+
+    def test_it_should_hold_added_items(self):
+        bloom_filter = BloomFilter(1 << 14, 7)
+        added = [uuid.uuid4().hex for _ in range(1000)]
+        for item in added:
+            bloom_filter.add(item)
+
+        self.assertTrue(all(item in bloom_filter for item in added))
+        false_positives = sum(
+            uuid.uuid4().hex in bloom_filter for _ in range(1000)
+        )
+        self.assertLess(false_positives, 50)
+
+
+class TestRevocationStore(TestCase):
+    """Tests for Revocation Store
+    """
+
+    def setUp(self):
+        get_cache().clear()
+        revocation_store.invalidate()
+        self.addCleanup(get_cache().clear)
+        self.addCleanup(revocation_store.invalidate)
+        self.user = User.objects.create_user(username="test_username")
+
+    def test_it_should_rule_out_tokens_without_queries(self):
+        revoked, other = RefreshToken.for_user(self.user), RefreshToken()
+        revocation_store.get_filter()
+        revocation_store.revoke(revoked)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(revocation_store.is_revoked(revoked))
+            self.assertFalse(revocation_store.is_revoked(other))
+
+    def test_it_should_look_up_tokens_without_bloom_filter(self):
+        token = RefreshToken.for_user(self.user)
+        with self.settings(AUTH_REVOCATION_BLOOM_BITS=0):
+            with self.assertNumQueries(1):
+                self.assertFalse(revocation_store.is_revoked(token))
+                self.assertFalse(revocation_store.is_revoked(token))
+
+            RevokedToken.objects.create(
+                jti=token["jti"], expires_at=timezone.now()
+            )
+            get_cache().clear()
+            self.assertTrue(revocation_store.is_revoked(token))
+
+    def test_it_should_sync_tokens_revoked_elsewhere(self):
+        token = RefreshToken.for_user(self.user)
+        self.assertFalse(revocation_store.is_revoked(token))
+
+        RevokedToken.objects.create(
+            jti=token["jti"],
+            expires_at=timezone.now() + datetime.timedelta(days=1),
+        )
+        self.assertFalse(revocation_store.is_revoked(token))
+        with self.settings(AUTH_REVOCATION_SYNC_SECONDS=0):
+            self.assertTrue(revocation_store.is_revoked(token))
+
+    def test_it_should_compact_expired_tokens(self):
+        now = timezone.now()
+        for jti, days in (("expired", -1), ("unexpired", 1)):
+            RevokedToken.objects.create(
+                jti=jti, expires_at=now + datetime.timedelta(days=days)
+            )
+
+        out = StringIO()
+        call_command("compact_revoked_tokens", stdout=out)
+        self.assertEqual(out.getvalue(), "Deleted 1 expired revoked tokens\n")
+        self.assertEqual(
+            list(RevokedToken.objects.values_list("jti", flat=True)),
+            ["unexpired"],
+        )
+
+
+class TestTokenRevokeView(APIViewTestCase):
+    """Tests for Token Revoke View
+    """
+    view_name = "token_revoke"
+
+    def setUp(self):
+        get_cache().clear()
+        revocation_store.invalidate()
+        self.addCleanup(get_cache().clear)
+        self.addCleanup(revocation_store.invalidate)
+        self.user = User.objects.create_user(username="test_username")
+        self.refresh = str(RefreshToken.for_user(self.user))
+
+    def refresh_token(self):
+        self.view_name = "token_refresh"
+        return self.view_post(data={"refresh": self.refresh})
+
+    def test_it_should_refuse_revoked_refresh_tokens(self):
+        self.assertEqual(self.refresh_token().status_code, 200)
+
+        self.view_name = "token_revoke"
+        result = self.view_post(data={"token": self.refresh})
+        self.assertEqual(result.status_code, 204)
+        self.assertTrue(RevokedToken.objects.exists())
+
+        result = self.refresh_token()
+        self.assertEqual(result.status_code, 401)
+
+    def test_it_should_return_401_if_token_invalid(self):
+        result = self.view_post(data={"token": "invalid"})
+        self.assertEqual(result.status_code, 401)
+
+    def test_it_should_refuse_refresh_tokens_of_inactive_users(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.refresh_token().status_code, 401)
@@ -2,11 +2,19 @@
 """
 
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
 
-from authenticate.views import AuthTokenObtainPairView
+from authenticate.views import (
+    AuthTokenObtainPairView,
+    AuthTokenRefreshView,
+    JWKSView,
+    TokenRevokeView,
+)
 
 urlpatterns = [
     path('token/', AuthTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path(
+        "token/refresh/", AuthTokenRefreshView.as_view(), name="token_refresh"
+    ),
+    path("token/revoke/", TokenRevokeView.as_view(), name="token_revoke"),
+    path("jwks/", JWKSView.as_view(), name="jwks"),
 ]
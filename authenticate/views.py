@@ -1,11 +1,66 @@
 """Views for auth api app
 """
 
-from rest_framework_simplejwt.views import TokenObtainPairView
-from authenticate.serializers import AuthTokenObtainPairSerializer
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt import state
+from rest_framework_simplejwt.views import (
+    TokenObtainPairView,
+    TokenRefreshView,
+    TokenViewBase,
+)
+from authenticate.serializers import (
+    AuthTokenObtainPairSerializer,
+    AuthTokenRefreshSerializer,
+    TokenRevokeSerializer,
+)
 
 class AuthTokenObtainPairView(TokenObtainPairView):
     """Token Obtain Pair View
 
     """
     serializer_class = AuthTokenObtainPairSerializer
+
+
+class AuthTokenRefreshView(TokenRefreshView):
+    """Token Refresh View
+
+    Refuses revoked refresh tokens.
+    """
+    serializer_class = AuthTokenRefreshSerializer
+
+
+class TokenRevokeView(TokenViewBase):
+    """Token Revoke View
+
+    Revokes the given access or refresh token until it expires.
+    """
+    serializer_class = TokenRevokeSerializer
+
+    def post(self, request, *args, **kwargs):
+        super().post(request, *args, **kwargs)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class JWKSView(APIView):
+    """JSON Web Key Set View
+
+    Publishes the public keys tokens are signed with, none when they are
+    signed with the secret key.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    renderer_classes = [JSONRenderer]
+
+    def get(self, request):
+        jwks = getattr(state.token_backend, "jwks", {"keys": []})
+        response = Response(jwks)
+        patch_cache_control(
+            response, public=True, max_age=settings.AUTH_JWKS_MAX_AGE
+        )
+        return response
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
+    "django_filters",
 ]
 
 PROJECT_APPS = [
@@ -51,16 +52,21 @@ PROJECT_APPS = [
 
 INSTALLED_APPS.extend(PROJECT_APPS)
 
+# The session, CSRF, authentication and message middleware of authenticate
+# skip the requests under API_PATH_PREFIX, which are authenticated with JWTs
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "sor.middleware.PrimaryPinningMiddleware",
+    "authenticate.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "authenticate.middleware.CsrfViewMiddleware",
+    "authenticate.middleware.AuthenticationMiddleware",
+    "authenticate.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+API_PATH_PREFIX = "/api/"
+
 ROOT_URLCONF = "config.urls"
 
 WSGI_APPLICATION = "config.wsgi.application"
@@ -68,14 +74,139 @@ WSGI_APPLICATION = "config.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/3.0/ref/settings/#databases
+# DATABASE_ENGINE selects "sqlite" (the default, also used by the tests) or
+# "postgresql", configured from the DATABASE_* environment variables.
+
+DATABASE_ENGINE = os.environ.get("DATABASE_ENGINE", "sqlite")
+
+if DATABASE_ENGINE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("DATABASE_NAME", "bedrock"),
+            "USER": os.environ.get("DATABASE_USER", "bedrock"),
+            "PASSWORD": os.environ.get("DATABASE_PASSWORD", ""),
+            "HOST": os.environ.get("DATABASE_HOST", "localhost"),
+            "PORT": os.environ.get("DATABASE_PORT", "5432"),
+            # Keep connections open between requests, and check them
+            # before reuse (see sor.db)
+            "CONN_MAX_AGE": int(os.environ.get("DATABASE_CONN_MAX_AGE", 600)),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "connect_timeout": int(
+                    os.environ.get("DATABASE_CONNECT_TIMEOUT", 5)
+                ),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get(
+                "DATABASE_NAME", os.path.join(BASE_DIR, "db.sqlite3")
+            ),
+            # Seconds a connection waits for a lock before failing with
+            # "database is locked"
+            "OPTIONS": {
+                "timeout": int(os.environ.get("DATABASE_TIMEOUT", 20)),
+            },
+        }
+    }
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+# Read replicas: SOR reads are spread over the SOR_DATABASE_REPLICAS aliases,
+# one copy of the default database per host in the comma separated
+# DATABASE_REPLICA_HOSTS. Requests that write, and the requests of the same
+# client for SOR_REPLICA_PIN_SECONDS after, read from the primary, as does
+# code outside of requests unless it opens sor.db.primary_pinning(). A replica
+# that can not be reached is retried after SOR_REPLICA_RETRY_SECONDS.
+
+SOR_DATABASE_REPLICAS = []
+for index, host in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICA_HOSTS", "").split(","))
+):
+    alias = "replica%d" % (index + 1)
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
     }
+    SOR_DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["sor.db.ReplicaRouter"]
+SOR_REPLICA_PIN_SECONDS = 5
+SOR_REPLICA_RETRY_SECONDS = 30
+
+# PRAGMA statements run on every new SQLite connection (see sor.db): WAL lets
+# readers run alongside a writer, and with synchronous=NORMAL commits only
+# sync the log at checkpoints. mmap_size is in bytes and a negative
+# cache_size in KiB.
+SOR_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.0/topics/cache/
+
+# The SOR response cache is local to each process by default, deployments
+# running several processes should point it at a shared backend such as
+# django.core.cache.backends.filebased.FileBasedCache or a Redis backend.
+# Responses are not cached inside transactions, e.g. with ATOMIC_REQUESTS.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "sor": {
+        "BACKEND": os.environ.get(
+            "SOR_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.environ.get("SOR_CACHE_LOCATION", "sor"),
+        "TIMEOUT": int(os.environ.get("SOR_CACHE_TIMEOUT", 300)),
+    },
 }
 
+SOR_CACHE_ALIAS = "sor"
+
+# Cache holding the deny-list of revoked access tokens and whether users are
+# active, which should be shared by all processes to revoke tokens everywhere
+AUTH_CACHE_ALIAS = "default"
+
+# Seconds whether a user is still active is cached by the stateless JWT
+# authentication, 0 trusts the access token claims alone
+AUTH_USER_CACHE_TIMEOUT = 30
+
+# PEM files of the RSA (RS256) or P-256 (ES256) keys JWTs are signed with,
+# which needs the cryptography package. The first key signs, the others are
+# only accepted, e.g. the next and previous keys while rotating. The public
+# keys are served at /api/auth/jwks/. Without keys, tokens are signed with
+# SECRET_KEY (HS256) and can only be verified here.
+AUTH_JWT_KEY_FILES = [
+    path
+    for path in os.environ.get("AUTH_JWT_KEY_FILES", "").split(",")
+    if path
+]
+
+# Seconds other services may cache the JWKS
+AUTH_JWKS_MAX_AGE = 300
+
+# Revoked tokens are ruled out by an in-process bloom filter of this many
+# bits, 0 looks every token up in the deny-list. 8 Mbit with 7 hashes hold
+# about 800,000 unexpired revoked tokens at a 1% false positive rate.
+AUTH_REVOCATION_BLOOM_BITS = 1 << 23
+AUTH_REVOCATION_BLOOM_HASHES = 7
+
+# Seconds the bloom filter of a process may miss tokens revoked by the
+# others, and seconds after which it is rebuilt, dropping the tokens
+# manage.py compact_revoked_tokens deleted
+AUTH_REVOCATION_SYNC_SECONDS = 5
+AUTH_REVOCATION_REBUILD_SECONDS = 3600
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -95,6 +226,34 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# https://docs.djangoproject.com/en/3.0/topics/auth/passwords/
+
+# Hasher of new passwords, "scrypt", "argon2" (needs argon2-cffi) or
+# "pbkdf2_sha256". Passwords hashed otherwise, or with other costs, are
+# rehashed on the next login. manage.py benchmark_login measures the logins
+# per second and core each hasher and cost allows.
+AUTH_PASSWORD_HASHER = os.environ.get("AUTH_PASSWORD_HASHER", "scrypt")
+
+AUTH_PASSWORD_HASHER_COSTS = {
+    # 16 MiB of memory and about 70 ms per hash
+    "scrypt": {"work_factor": 2 ** 14, "block_size": 8, "parallelism": 1},
+    "argon2": {"time_cost": 2, "memory_cost": 102400, "parallelism": 8},
+    "pbkdf2_sha256": {"iterations": 180000},
+}
+
+PASSWORD_HASHER_CLASSES = {
+    "scrypt": "authenticate.hashers.ScryptPasswordHasher",
+    "argon2": "authenticate.hashers.Argon2PasswordHasher",
+    "pbkdf2_sha256": "authenticate.hashers.PBKDF2PasswordHasher",
+}
+
+PASSWORD_HASHERS = [PASSWORD_HASHER_CLASSES[AUTH_PASSWORD_HASHER]] + [
+    hasher
+    for algorithm, hasher in PASSWORD_HASHER_CLASSES.items()
+    if algorithm != AUTH_PASSWORD_HASHER
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/3.0/topics/i18n/
@@ -147,10 +306,43 @@ REST_FRAMEWORK = {
     # Use Django's standard `django.contrib.auth` permissions,
     # or allow read-only access for unauthenticated users.
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "authenticate.authentication.StatelessJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
+    "DEFAULT_FILTER_BACKENDS": [
+        "django_filters.rest_framework.DjangoFilterBackend",
+        "rest_framework.filters.SearchFilter",
+        "rest_framework.filters.OrderingFilter",
+    ],
+    "DEFAULT_PAGINATION_CLASS": "sor.pagination.SorCursorPagination",
+    "PAGE_SIZE": 100,
     "TEST_REQUEST_DEFAULT_FORMAT": "json",
 }
+
+# Seconds SOR reference tables (owners, clusters, environments, operating
+# systems and labels) are kept in the in-process lookup cache, 0 disables it
+SOR_REFERENCE_CACHE_TTL = 300
+
+# Seconds SOR dashboard statistics are cached at most; writes to SOR
+# resources retire them sooner
+SOR_STATS_CACHE_TIMEOUT = 60
+
+# Seconds the SOR changes feed holds changes back so that transactions which
+# set updated_at before committing are not skipped by clients' cursors
+SOR_CHANGES_SAFETY_SECONDS = 5
+
+# Budgets manage.py benchmark_sor and the benchmark tests check: the most
+# queries an operation may run on any endpoint, whatever the number of rows,
+# and its 95th percentile latency in milliseconds. "<endpoint>.<operation>"
+# entries override the budget of an operation for one endpoint.
+SOR_BENCHMARK_BUDGETS = {
+    "create": {"queries": 20, "p95_ms": 200},
+    "retrieve": {"queries": 4, "p95_ms": 100},
+    "update": {"queries": 20, "p95_ms": 200},
+    "list": {"queries": 3, "p95_ms": 500},
+}
+
+# Leaves out the tests tagged "benchmark" unless run with --tag benchmark
+TEST_RUNNER = "sor.runner.SorTestRunner"
@@ -44,6 +44,21 @@ export const SorApiService = {
   get(resource, slug = '') {
     return ApiService.get(`sor/${resource}`, slug);
   },
+  list(resource) {
+    // Follow the cursor links until the last page
+    const fetchPage = (url, resources) =>
+      ApiClient.get(url, {
+        headers: {
+          Authorization: '',
+        },
+      }).then(response => {
+        resources.push(...response.data.results);
+        return response.data.next
+          ? fetchPage(response.data.next, resources)
+          : resources;
+      });
+    return fetchPage(`sor/${resource}/`, []);
+  },
   post(resource, params) {
     return ApiService.post(`sor/${resource}`, params);
   },
@@ -53,11 +53,11 @@ const mutations = {
 const actions = {
   [action.FETCH_RESOURCES]({ commit }, type) {
     commit(mutation.FETCH_PENDING, true);
-    return SorApiService.get(type)
-      .then(response => {
+    return SorApiService.list(type)
+      .then(resources => {
         commit(mutation.SET_RESOURCES, {
           type: type,
-          resources: response.data,
+          resources: resources,
         });
       })
       .catch(error => {
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class SorConfig(AppConfig):
     name = 'sor'
+
+    def ready(self):
+        import sor.db  # noqa: F401
+        import sor.signals  # noqa: F401
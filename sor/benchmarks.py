@@ -0,0 +1,225 @@
+"""Benchmarks of the SOR api endpoints
+"""
+
+import contextlib
+import math
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from sor.lookups import REFERENCE_CACHES
+
+# Responses are not cached, so every request reaches the database
+BENCHMARK_CACHES = {
+    alias: {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    for alias in settings.CACHES
+}
+
+OPERATIONS = ["create", "retrieve", "update", "list"]
+
+
+def get_server_payload(index):
+    return {
+        "name": "benchserver%d" % index,
+        "ip_address": "192.168.%d.%d" % (index >> 8 & 255, index & 255),
+        "owner": "owner0",
+        "domain": "domain0.example.com",
+        "cluster": "cluster0",
+        "operating_system": "LINUX 0",
+        "environments": ["DEV0"],
+        "labels": ["label0", "label1"],
+    }
+
+
+# For each endpoint, the payload creating its n-th object and the one
+# updating it
+ENDPOINTS = {
+    "label": (
+        lambda index: {"name": "benchlabel%d" % index},
+        lambda index: {"name": "benchlabel%d-renamed" % index},
+    ),
+    "owner": (
+        lambda index: {
+            "name": "benchowner%d" % index,
+            "email": "bench@example.com",
+        },
+        lambda index: {"description": "Updated %d" % index},
+    ),
+    "cluster": (
+        lambda index: {"name": "benchcluster%d" % index},
+        lambda index: {"description": "Updated %d" % index},
+    ),
+    "environment": (
+        lambda index: {"name": "benchenv%d" % index, "category": "DEV"},
+        lambda index: {"description": "Updated %d" % index},
+    ),
+    "domain": (
+        lambda index: {
+            "name": "bench%d.example.com" % index,
+            "owner": "owner0",
+        },
+        lambda index: {"description": "Updated %d" % index},
+    ),
+    "operatingsystem": (
+        lambda index: {"name": "bench os %d" % index, "version": "1.0"},
+        lambda index: {"version": "2.%d" % index},
+    ),
+    "server": (
+        get_server_payload,
+        lambda index: {"description": "Updated %d" % index},
+    ),
+    "product": (
+        lambda index: {
+            "name": "benchproduct%d" % index,
+            "version": "1.0",
+            "owner": "owner0",
+        },
+        lambda index: {"version": "2.%d" % index},
+    ),
+}
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def invalidate_reference_caches():
+    for reference in REFERENCE_CACHES.values():
+        reference.invalidate()
+
+
+@contextlib.contextmanager
+def scratch_database(name, **options):
+    """Points the default SQLite database at the file ``name`` for the
+    block, with ``options`` as connection options, and migrates it
+
+    Reference caches are emptied on the way in and out, as their rows come
+    from the other database.
+    """
+    if connection.vendor != "sqlite":
+        raise BenchmarkError("Benchmarks only run on SQLite")
+
+    settings_dict = connections.databases["default"]
+    original_settings = dict(settings_dict)
+    connection.close()
+    settings_dict.update(
+        NAME=name, OPTIONS={**original_settings["OPTIONS"], **options}
+    )
+    invalidate_reference_caches()
+    try:
+        with override_settings(CACHES=BENCHMARK_CACHES):
+            call_command("migrate", verbosity=0)
+            yield
+    finally:
+        connection.close()
+        settings_dict.clear()
+        settings_dict.update(original_settings)
+        invalidate_reference_caches()
+
+
+def get_percentile(timings, percent):
+    """Returns the nearest rank ``percent`` percentile of ``timings``
+    """
+    timings = sorted(timings)
+    return timings[max(0, math.ceil(percent / 100 * len(timings)) - 1)]
+
+
+def measure(client, method, url, data=None):
+    """Returns the seconds and the number of queries a request took
+    """
+    # Only the queries of the request are needed
+    connection.queries_log.clear()
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        response = getattr(client, method)(url, data, format="json")
+        elapsed = time.perf_counter() - start
+
+    if response.status_code >= 400:
+        raise BenchmarkError(
+            "%s %s failed with %d: %s"
+            % (method.upper(), url, response.status_code, response.content)
+        )
+    return elapsed, len(queries), response
+
+
+def run_benchmarks(client, requests, endpoints=None):
+    """Creates, retrieves, updates and lists ``requests`` objects of each
+    endpoint with ``client`` and returns the latency percentiles, in
+    milliseconds, and the most queries of every operation
+    """
+    results = []
+    for endpoint in endpoints or ENDPOINTS:
+        get_create_payload, get_update_payload = ENDPOINTS[endpoint]
+        list_url = reverse("%s-list" % endpoint)
+        samples = {operation: [] for operation in OPERATIONS}
+
+        # Loads the reference caches and imports lazy modules beforehand
+        measure(client, "get", list_url)
+
+        urls = []
+        for index in range(requests):
+            sample = measure(
+                client, "post", list_url, get_create_payload(index)
+            )
+            samples["create"].append(sample)
+            urls.append(
+                reverse("%s-detail" % endpoint, args=[sample[2].data["id"]])
+            )
+        for url in urls:
+            samples["retrieve"].append(measure(client, "get", url))
+        for index, url in enumerate(urls):
+            samples["update"].append(
+                measure(client, "patch", url, get_update_payload(index))
+            )
+        for _ in range(requests):
+            samples["list"].append(measure(client, "get", list_url))
+
+        for operation in OPERATIONS:
+            timings = [sample[0] * 1000 for sample in samples[operation]]
+            results.append(
+                {
+                    "endpoint": endpoint,
+                    "operation": operation,
+                    "p50_ms": get_percentile(timings, 50),
+                    "p95_ms": get_percentile(timings, 95),
+                    "p99_ms": get_percentile(timings, 99),
+                    "queries": max(sample[1] for sample in samples[operation]),
+                }
+            )
+    return results
+
+
+def get_budget(budgets, endpoint, operation):
+    """Returns the budget of an operation, where ``<endpoint>.<operation>``
+    entries override those of the operation on every endpoint
+    """
+    return {
+        **budgets.get(operation, {}),
+        **budgets.get("%s.%s" % (endpoint, operation), {}),
+    }
+
+
+def check_budgets(results, budgets, latency=True):
+    """Returns a description of every budget ``results`` exceed
+    """
+    violations = []
+    for result in results:
+        budget = get_budget(budgets, result["endpoint"], result["operation"])
+        limits = ["queries"] + (["p95_ms"] if latency else [])
+        for limit in limits:
+            if limit in budget and result[limit] > budget[limit]:
+                violations.append(
+                    "%s %s: %s is %s, over the budget of %s"
+                    % (
+                        result["endpoint"],
+                        result["operation"],
+                        limit,
+                        round(result[limit], 1),
+                        budget[limit],
+                    )
+                )
+    return violations
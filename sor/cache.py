@@ -0,0 +1,96 @@
+"""Response cache for SOR api app
+"""
+
+import hashlib
+import time
+import uuid
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import connection
+from django.utils import timezone
+
+from sor.db import primary_pinning
+
+
+def get_cache():
+    return caches[settings.SOR_CACHE_ALIAS]
+
+
+def is_available():
+    """Only committed data is cached, so the cache is bypassed inside
+    transactions
+    """
+    return not connection.in_atomic_block
+
+
+def get_version_key(model):
+    return "sor:version:%s" % model._meta.label_lower
+
+
+def new_version():
+    """Returns a new random version token, which records when it was made
+    """
+    return "%s:%d" % (uuid.uuid4().hex, time.time())
+
+
+def get_version_time(version):
+    """Returns when ``version`` was made, now for tokens without a time
+    """
+    made_at = version.partition(":")[2]
+    if not made_at.isdigit():
+        return timezone.now()
+    return datetime.fromtimestamp(int(made_at), timezone.utc)
+
+
+def get_versions(models):
+    """Returns the current version token of every model
+
+    A missing token, never set or evicted, is replaced with a new random one
+    so entries cached under an older token can not be served again. Caches
+    that keep nothing, such as the dummy one, get a new token every time.
+    """
+    cache = get_cache()
+    keys = [get_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            cache.add(key, new_version(), timeout=None)
+            versions[key] = cache.get(key) or new_version()
+    return [versions[key] for key in keys]
+
+
+def invalidate(model):
+    """Retires every cached response that depends on ``model``
+    """
+    get_cache().set(get_version_key(model), new_version(), timeout=None)
+
+
+def get_key(models, *parts):
+    """Returns the cache key of a response rendered from ``models``
+    """
+    value = repr((get_versions(models),) + parts)
+    return "sor:response:%s" % hashlib.md5(value.encode()).hexdigest()
+
+
+def get_or_set(models, parts, compute, timeout=DEFAULT_TIMEOUT):
+    """Returns the value computed from ``models`` for ``parts``, calling
+    ``compute`` only when it is not cached under their current versions
+
+    Values are computed from the primary, as a replica may not have caught
+    up yet with the write that retired the previous one.
+    """
+    if not is_available():
+        return compute()
+
+    cache = get_cache()
+    key = get_key(models, *parts)
+    value = cache.get(key)
+    if value is None:
+        with primary_pinning(pinned=True):
+            value = compute()
+        cache.set(key, value, timeout)
+    return value
@@ -0,0 +1,137 @@
+"""Database connection hooks and routing for SOR api app
+"""
+
+import contextlib
+import contextvars
+import itertools
+import time
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.backends.signals import connection_created
+
+# Set once the current request or task has written, so that its following
+# reads see the write instead of a lagging replica. None outside of any
+# pinning scope, where nothing would ever unpin the context.
+_pinned_to_primary = contextvars.ContextVar(
+    "sor_pinned_to_primary", default=None
+)
+
+
+def close_unusable_connections(**kwargs):
+    """Closes persistent connections that can no longer be used, before a
+    request runs its first query on them
+
+    Django closes a persistent connection only once a query failed on it, so
+    a connection dropped by the server while idle would fail one request.
+    Databases with ``CONN_HEALTH_CHECKS`` are checked instead.
+    """
+    for connection in connections.all():
+        if (
+            connection.settings_dict.get("CONN_HEALTH_CHECKS")
+            and connection.connection is not None
+            and not connection.in_atomic_block
+            and not connection.is_usable()
+        ):
+            connection.close()
+
+
+def setup_sqlite_connection(sender, connection, **kwargs):
+    """Runs the ``SOR_SQLITE_PRAGMAS`` on every new SQLite connection
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        for name, value in settings.SOR_SQLITE_PRAGMAS.items():
+            cursor.execute("PRAGMA %s = %s" % (name, value))
+
+
+def pin_to_primary():
+    if _pinned_to_primary.get() is not None:
+        _pinned_to_primary.set(True)
+
+
+def is_pinned_to_primary():
+    """Reads outside of a pinning scope always go to the primary
+    """
+    return _pinned_to_primary.get() is not False
+
+
+@contextlib.contextmanager
+def primary_pinning(pinned=False):
+    """Scopes pinning to the primary to a block, such as a request or a
+    task, in which reads go to replicas until the first write
+
+    Requests get their scope from PrimaryPinningMiddleware; shells,
+    management commands and workers read from the primary unless they open
+    one.
+    """
+    token = _pinned_to_primary.set(pinned)
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(token)
+
+
+class ReplicaRouter:
+    """Spreads reads of SOR models over the ``SOR_DATABASE_REPLICAS``
+
+    Replicas are used in turn. A replica that can not be connected to is
+    skipped for ``SOR_REPLICA_RETRY_SECONDS``, and reads fall back to the
+    primary when no replica is left. Writes go to the primary and pin the
+    reads of the rest of their pinning scope to it.
+    """
+
+    def __init__(self):
+        self._turns = itertools.count()
+        self._down_until = {}
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != "sor" or is_pinned_to_primary():
+            return None
+
+        replicas = settings.SOR_DATABASE_REPLICAS
+        for _ in replicas:
+            alias = replicas[next(self._turns) % len(replicas)]
+            if self.is_available(alias):
+                return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.SOR_DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas receive the schema from the primary
+        if db in settings.SOR_DATABASE_REPLICAS:
+            return False
+        return None
+
+    def is_available(self, alias):
+        if time.monotonic() < self._down_until.get(alias, 0):
+            return False
+
+        try:
+            connections[alias].ensure_connection()
+        except OperationalError:
+            self._down_until[alias] = (
+                time.monotonic() + settings.SOR_REPLICA_RETRY_SECONDS
+            )
+            return False
+        return True
+
+
+request_started.connect(
+    close_unusable_connections, dispatch_uid="sor_connection_health"
+)
+connection_created.connect(
+    setup_sqlite_connection, dispatch_uid="sor_sqlite_connection"
+)
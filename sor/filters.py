@@ -0,0 +1,81 @@
+"""Filters for SOR api app
+"""
+
+from django_filters import rest_framework as filters
+
+from sor.models import (
+    Environment,
+    Domain,
+    Server,
+    Product,
+)
+
+
+class DomainFilter(filters.FilterSet):
+    """Filters domains by status, location and owner name
+    """
+
+    owner = filters.CharFilter(field_name="owner__name")
+
+    class Meta:
+        model = Domain
+        fields = ["status", "location", "owner"]
+
+
+class ServerFilter(filters.FilterSet):
+    """Filters servers by their attributes and related resource names
+
+    ``fqdn`` filters on the annotation of ``Server.objects.with_fqdn()``.
+    """
+
+    owner = filters.CharFilter(field_name="owner__name")
+    domain = filters.CharFilter(field_name="domain__name")
+    cluster = filters.CharFilter(method="filter_cluster")
+    operating_system = filters.CharFilter(field_name="operating_system__name")
+    environment = filters.CharFilter(method="filter_environment")
+    environment_category = filters.ChoiceFilter(
+        field_name="environments__category",
+        choices=Environment.Category.choices,
+        distinct=True,
+    )
+    label = filters.CharFilter(method="filter_label")
+    ip_prefix = filters.CharFilter(
+        field_name="ip_address", lookup_expr="startswith"
+    )
+    fqdn = filters.CharFilter(field_name="fqdn")
+
+    class Meta:
+        model = Server
+        fields = [
+            "fqdn",
+            "status",
+            "category",
+            "owner",
+            "domain",
+            "cluster",
+            "operating_system",
+            "environment",
+            "environment_category",
+            "label",
+            "ip_prefix",
+        ]
+
+    def filter_cluster(self, queryset, name, value):
+        return queryset.by_cluster(value)
+
+    def filter_environment(self, queryset, name, value):
+        return queryset.in_environment(value)
+
+    def filter_label(self, queryset, name, value):
+        return queryset.with_label(value)
+
+
+class ProductFilter(filters.FilterSet):
+    """Filters products by version and owner name
+    """
+
+    owner = filters.CharFilter(field_name="owner__name")
+
+    class Meta:
+        model = Product
+        fields = ["version", "owner"]
@@ -0,0 +1,100 @@
+"""Ansible dynamic inventory for SOR api app
+"""
+
+import re
+
+from sor.models import (
+    Owner,
+    Cluster,
+    Environment,
+    Domain,
+    Label,
+    OperatingSystem,
+    Server,
+)
+
+# Models an inventory is built or filtered from, whose writes retire cached
+# inventories. ServerFilter also filters servers by owner name.
+INVENTORY_MODELS = [
+    Server,
+    Owner,
+    Domain,
+    Cluster,
+    Environment,
+    Label,
+    OperatingSystem,
+]
+
+
+def get_group_name(prefix, value):
+    """Returns a valid Ansible group name for ``value``
+    """
+    return "%s_%s" % (prefix, re.sub(r"\W", "_", value).lower())
+
+
+def build_inventory(queryset):
+    """Returns the Ansible inventory of the servers in ``queryset``, which
+    is annotated with ``Server.objects.with_fqdn()``
+
+    Servers are grouped by cluster, environment, label, category and
+    operating system, and named by their fully qualified domain name. The
+    inventory is read with one query for the servers and one for each
+    many-to-many relation, whatever the number of servers.
+    """
+    queryset = queryset.prefetch_related(None)
+    groups = {}
+    hostvars = {}
+    hosts = {}
+
+    def add_host(group, host):
+        groups.setdefault(group, []).append(host)
+
+    rows = queryset.values_list(
+        "id",
+        "fqdn",
+        "ip_address",
+        "status",
+        "category",
+        "cluster__name",
+        "operating_system__name",
+    )
+    for (
+        server_id,
+        host,
+        ip_address,
+        status,
+        category,
+        cluster,
+        operating_system,
+    ) in rows:
+        hosts[server_id] = host
+        hostvars[host] = {
+            "ansible_host": ip_address,
+            "sor_id": server_id,
+            "sor_status": status,
+        }
+        add_host(get_group_name("category", category), host)
+        add_host(get_group_name("os", operating_system), host)
+        if cluster is not None:
+            add_host(get_group_name("cluster", cluster), host)
+
+    server_ids = queryset.values("pk")
+    for prefix, field in (("env", "environments"), ("label", "labels")):
+        through = Server._meta.get_field(field).remote_field.through
+        rows = through.objects.filter(server__in=server_ids).values_list(
+            "server_id", "%s__name" % field[:-1]
+        )
+        for server_id, value in rows:
+            if server_id in hosts:
+                add_host(get_group_name(prefix, value), hosts[server_id])
+
+    inventory = {
+        group: {"hosts": sorted(members)}
+        for group, members in sorted(groups.items())
+    }
+    inventory["all"] = {
+        "hosts": sorted(hostvars),
+        "children": sorted(groups),
+    }
+    inventory["_meta"] = {"hostvars": hostvars}
+    return inventory
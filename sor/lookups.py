@@ -0,0 +1,104 @@
+"""In-process lookup cache for SOR reference tables
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection
+
+from sor.models import (
+    Label,
+    Owner,
+    Cluster,
+    Environment,
+    OperatingSystem,
+)
+
+
+class ReferenceCache:
+    """Keeps every row of a small reference table in memory
+
+    Rows are looked up by name or by id. The cache is dropped whenever the
+    table is written and reloaded at the latest every
+    ``SOR_REFERENCE_CACHE_TTL`` seconds, or as soon as an id is missing
+    from it, such as one written by another process.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._rows = None
+
+    @property
+    def ttl(self):
+        return getattr(settings, "SOR_REFERENCE_CACHE_TTL", 300)
+
+    def is_available(self):
+        """Only committed rows are cached, so the cache is bypassed inside
+        transactions
+        """
+        return self.ttl > 0 and not connection.in_atomic_block
+
+    def get_by_name(self, name):
+        return self._get_rows()["by_name"].get(name)
+
+    def get_by_id(self, pk):
+        rows = self._get_rows()
+        if pk not in rows["by_id"] and pk not in rows["missing"]:
+            self.invalidate()
+            rows = self._get_rows()
+            # Ids still missing after the reload do not trigger another one
+            if pk not in rows["by_id"]:
+                rows["missing"].add(pk)
+        return rows["by_id"].get(pk)
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._rows = None
+
+    def _get_rows(self):
+        rows = self._rows
+        if rows is not None and time.monotonic() < rows["expires_at"]:
+            return rows
+
+        generation = self._generation
+        # Rows read from a lagging replica could outlive the invalidation
+        # of the write they miss
+        instances = list(
+            self.model._default_manager.using(DEFAULT_DB_ALIAS).order_by("pk")
+        )
+
+        by_name = {}
+        for instance in instances:
+            by_name.setdefault(instance.name, instance)
+
+        rows = {
+            "expires_at": time.monotonic() + self.ttl,
+            "by_name": by_name,
+            "by_id": {instance.pk: instance for instance in instances},
+            "missing": set(),
+        }
+
+        # Keep the rows only if no write invalidated them while loading
+        with self._lock:
+            if generation == self._generation:
+                self._rows = rows
+        return rows
+
+
+REFERENCE_CACHES = {
+    model: ReferenceCache(model)
+    for model in (Owner, Cluster, Environment, OperatingSystem, Label)
+}
+
+
+def get_reference_cache(model):
+    """Returns the reference cache of ``model`` if it can be used right now
+    """
+    reference = REFERENCE_CACHES.get(model)
+    if reference is not None and reference.is_available():
+        return reference
+    return None
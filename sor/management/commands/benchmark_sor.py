@@ -0,0 +1,103 @@
+"""Benchmarks the SOR api endpoints against their budgets
+"""
+
+import os
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIClient
+
+from sor.benchmarks import (
+    ENDPOINTS,
+    BenchmarkError,
+    check_budgets,
+    run_benchmarks,
+    scratch_database,
+)
+from sor.seed import seed_sor
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds scratch SQLite databases at each scale, measures latency "
+        "percentiles and query counts of every SOR endpoint and fails when "
+        "SOR_BENCHMARK_BUDGETS are exceeded"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=int,
+            action="append",
+            dest="scales",
+            help="Number of servers to seed, may be repeated (1000)",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=20,
+            help="Requests per operation and endpoint",
+        )
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            dest="endpoints",
+            choices=list(ENDPOINTS),
+            help="Endpoint to benchmark, may be repeated (all)",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        violations = []
+        for scale in options["scales"] or [1000]:
+            try:
+                results = self.benchmark(scale, **options)
+            except BenchmarkError as error:
+                raise CommandError(error)
+
+            self.stdout.write("%d servers" % scale)
+            self.stdout.write(
+                "  %-16s %-9s %9s %9s %9s %8s"
+                % (
+                    "endpoint",
+                    "operation",
+                    "p50 ms",
+                    "p95 ms",
+                    "p99 ms",
+                    "queries",
+                )
+            )
+            for result in results:
+                self.stdout.write(
+                    "  %-16s %-9s %9.1f %9.1f %9.1f %8d"
+                    % (
+                        result["endpoint"],
+                        result["operation"],
+                        result["p50_ms"],
+                        result["p95_ms"],
+                        result["p99_ms"],
+                        result["queries"],
+                    )
+                )
+            violations.extend(
+                "%d servers, %s" % (scale, violation)
+                for violation in check_budgets(
+                    results, settings.SOR_BENCHMARK_BUDGETS
+                )
+            )
+
+        if violations:
+            raise CommandError("Budgets exceeded:\n%s" % "\n".join(violations))
+        self.stdout.write(self.style.SUCCESS("All budgets met"))
+
+    def benchmark(self, scale, requests, endpoints, seed, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            with scratch_database(os.path.join(directory, "db.sqlite3")):
+                seed_sor(scale, seed=seed)
+                client = APIClient(HTTP_HOST="localhost")
+                client.force_authenticate(
+                    user=User.objects.create_user("benchmark")
+                )
+                return run_benchmarks(client, requests, endpoints)
@@ -0,0 +1,160 @@
+"""Benchmarks concurrent SOR api reads and writes on SQLite
+"""
+
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from sor.benchmarks import BENCHMARK_CACHES
+from sor.models import Owner, Domain, OperatingSystem, Server
+
+# SQLite connection settings before SOR_SQLITE_PRAGMAS, for comparison
+BASELINE_PRAGMAS = {"journal_mode": "DELETE", "synchronous": "FULL"}
+BASELINE_TIMEOUT = 5
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs concurrent readers and writers against the server endpoints "
+        "on a scratch SQLite database, first with the baseline connection "
+        "settings and then with SOR_SQLITE_PRAGMAS, and reports throughput"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=5.0,
+            help="Seconds each configuration runs",
+        )
+        parser.add_argument("--servers", type=int, default=200)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("The benchmark only runs on SQLite")
+
+        settings_dict = connections.databases["default"]
+        original_settings = dict(settings_dict)
+        timeout = settings_dict.get("OPTIONS", {}).get("timeout", 5)
+        modes = [
+            ("baseline", BASELINE_PRAGMAS, BASELINE_TIMEOUT),
+            ("configured", settings.SOR_SQLITE_PRAGMAS, timeout),
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            for name, pragmas, timeout in modes:
+                connection.close()
+                settings_dict.update(
+                    NAME=os.path.join(directory, "%s.sqlite3" % name),
+                    OPTIONS={
+                        **original_settings["OPTIONS"],
+                        "timeout": timeout,
+                    },
+                )
+                try:
+                    with override_settings(
+                        SOR_SQLITE_PRAGMAS=pragmas, CACHES=BENCHMARK_CACHES
+                    ):
+                        call_command("migrate", verbosity=0)
+                        server_ids, user = self.seed(options["servers"])
+                        connection.close()
+                        counts = self.run(server_ids, user, **options)
+                finally:
+                    connection.close()
+                    settings_dict.clear()
+                    settings_dict.update(original_settings)
+
+                duration = options["duration"]
+                self.stdout.write(
+                    "%-10s %9.1f reads/s %9.1f writes/s %6d errors"
+                    % (
+                        name,
+                        counts["read"] / duration,
+                        counts["write"] / duration,
+                        counts["error"],
+                    )
+                )
+
+    def seed(self, count):
+        owner = Owner.objects.create(name="BENCHMARK", email="b@example.com")
+        domain = Domain.objects.create(name="benchmark.local", owner=owner)
+        operating_system = OperatingSystem.objects.create(
+            name="BENCHMARK OS", version="1.0"
+        )
+        Server.objects.bulk_create(
+            Server(
+                name="benchmark%d" % index,
+                ip_address="10.%d.%d.%d"
+                % (index >> 16, (index >> 8) & 255, index & 255),
+                owner=owner,
+                domain=domain,
+                operating_system=operating_system,
+            )
+            for index in range(count)
+        )
+        user = User.objects.create_user("benchmark", "b@example.com")
+        return list(Server.objects.values_list("id", flat=True)), user
+
+    def run(self, server_ids, user, readers, writers, duration, **options):
+        counts = {"read": 0, "write": 0, "error": 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + duration
+        list_url = reverse("server-list")
+
+        def work(kind, seed):
+            choice = random.Random(seed).choice
+            client = APIClient(HTTP_HOST="localhost")
+            client.force_authenticate(user=user)
+            done = errors = 0
+            try:
+                while time.monotonic() < deadline:
+                    url = reverse("server-detail", args=[choice(server_ids)])
+                    try:
+                        if kind == "read":
+                            response = client.get(list_url, {"page_size": 50})
+                        else:
+                            response = client.patch(
+                                url,
+                                {"description": uuid.uuid4().hex},
+                                format="json",
+                            )
+                    except OperationalError:
+                        errors += 1
+                        continue
+                    if response.status_code >= 400:
+                        errors += 1
+                    else:
+                        done += 1
+            finally:
+                connection.close()
+
+            with lock:
+                counts[kind] += done
+                counts["error"] += errors
+
+        threads = [
+            threading.Thread(target=work, args=("read", index))
+            for index in range(readers)
+        ] + [
+            threading.Thread(target=work, args=("write", readers + index))
+            for index in range(writers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return counts
@@ -0,0 +1,44 @@
+"""Seeds the SOR with synthetic data
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sor.seed import SeedError, seed_sor
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills an empty SOR with servers and the owners, domains, clusters, "
+        "environments, operating systems, labels and products they refer "
+        "to, the same ones for the same --servers and --seed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--servers", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10000,
+            help="Servers built and inserted at a time",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            seed_sor(
+                options["servers"],
+                seed=options["seed"],
+                chunk_size=options["chunk_size"],
+            )
+        except SeedError as error:
+            raise CommandError(error)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Seeded %d servers in %.1fs"
+                % (options["servers"], time.perf_counter() - start)
+            )
+        )
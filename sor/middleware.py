@@ -0,0 +1,35 @@
+"""Middleware for SOR api app
+"""
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+from sor.db import primary_pinning
+
+
+class PrimaryPinningMiddleware:
+    """Reads from the primary database in requests that write, and in the
+    requests of the same client for ``SOR_REPLICA_PIN_SECONDS`` after, so
+    clients see their own writes despite replication lag
+    """
+
+    cookie_name = "sor_pin_primary"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        writes = request.method not in SAFE_METHODS
+        pinned = writes or self.cookie_name in request.COOKIES
+
+        with primary_pinning(pinned):
+            response = self.get_response(request)
+
+        if writes and settings.SOR_DATABASE_REPLICAS:
+            response.set_cookie(
+                self.cookie_name,
+                "1",
+                max_age=settings.SOR_REPLICA_PIN_SECONDS,
+                httponly=True,
+            )
+        return response
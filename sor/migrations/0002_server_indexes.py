@@ -0,0 +1,22 @@
+# Generated by Django 3.0.6 on 2026-10-18 19:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sor', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='server',
+            name='category',
+            field=models.CharField(choices=[('MAIL', 'Mail Server'), ('FTP', 'FTP Server'), ('WEB', 'Web Server'), ('PROXY', 'Proxy Server'), ('APP', 'Application Server'), ('BUILD', 'Build Server')], db_index=True, default='WEB', max_length=5),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=models.Index(fields=['status', 'category'], name='sor_server_status_category_idx'),
+        ),
+    ]
@@ -0,0 +1,502 @@
+"""View mixins for SOR api app
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import ProtectedError, Q
+from django.db.models.deletion import Collector
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date, parse_http_date_safe
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from sor import cache as response_cache
+from sor.db import primary_pinning
+from sor.models import Tombstone
+from sor.pagination import SorCursorPagination
+from sor.renderers import NDJSONRenderer, StreamingJSONRenderer
+from sor.serializers import get_related_models
+
+
+def get_requested_fields(view):
+    """Returns the fields a safe request asked the view to render, or None
+    for all of them
+    """
+    get_requested_fields = getattr(
+        view.get_serializer_class(), "get_requested_fields", None
+    )
+    if get_requested_fields is None or view.request.method not in SAFE_METHODS:
+        return None
+    return get_requested_fields(view.request.query_params)
+
+
+class EagerLoadingMixin:
+    """Applies the eager loading declared on the serializer class to the
+    view queryset, so list and retrieve run a fixed number of queries.
+
+    When a safe request asks for a subset of the fields, only their columns
+    and relations are loaded.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+
+        field_names = get_requested_fields(self)
+        setup_eager_loading = getattr(
+            serializer_class, "setup_eager_loading", None
+        )
+        if setup_eager_loading is not None:
+            queryset = setup_eager_loading(queryset, field_names)
+
+        if field_names is not None:
+            queryset = queryset.only(
+                *self.get_loaded_columns(queryset.model, field_names)
+            )
+        return queryset
+
+    def get_loaded_columns(self, model, field_names):
+        """Returns the concrete fields needed to render ``field_names``,
+        along with those used to order and validate the response
+        """
+        needed = set(field_names) | set(getattr(self, "ordering_fields", []))
+        needed |= {model._meta.pk.name, "updated_at"}
+
+        return [
+            field.name
+            for field in model._meta.concrete_fields
+            if field.name in needed
+        ]
+
+
+class BulkModelMixin:
+    """Create, update and destroy many objects in one request
+
+    A list payload posted to the collection creates every item, a list of
+    objects with ``id`` sent with PUT/PATCH updates them and a list of ids
+    sent with DELETE removes them. Each batch is written in one transaction
+    and validation errors are reported per item.
+    """
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        self.perform_bulk_create(serializer)
+        return Response(
+            self.get_bulk_response_data(serializer.instance),
+            status=status.HTTP_201_CREATED,
+        )
+
+    def bulk_update(self, request, *args, **kwargs):
+        partial = kwargs.pop("partial", False)
+
+        if not isinstance(request.data, list):
+            msg = "Incorrect Type. Expected a list but got %s" % (
+                type(request.data).__name__
+            )
+            raise ValidationError({"non_field_errors": [msg]})
+
+        ids = [
+            item.get("id") for item in request.data if isinstance(item, dict)
+        ]
+        instances = self.filter_queryset(self.get_queryset()).filter(
+            pk__in=[pk for pk in ids if type(pk) is int]
+        )
+
+        serializer = self.get_serializer(
+            list(instances), data=request.data, many=True, partial=partial
+        )
+        serializer.is_valid(raise_exception=True)
+        self.perform_bulk_update(serializer)
+        return Response(self.get_bulk_response_data(serializer.instance))
+
+    def partial_bulk_update(self, request, *args, **kwargs):
+        kwargs["partial"] = True
+        return self.bulk_update(request, *args, **kwargs)
+
+    def bulk_destroy(self, request, *args, **kwargs):
+        ids = request.data
+        # Booleans are ints too
+        if not isinstance(ids, list) or not all(type(pk) is int for pk in ids):
+            msg = "Incorrect Type. Expected a list of ids"
+            raise ValidationError({"non_field_errors": [msg]})
+
+        queryset = self.filter_queryset(self.get_queryset()).filter(pk__in=ids)
+        found = set(queryset.values_list("pk", flat=True))
+        msg = "Object with id %s does not exist"
+        errors = [{} if pk in found else {"id": [msg % pk]} for pk in ids]
+        if any(errors):
+            raise ValidationError(errors)
+
+        try:
+            self.perform_bulk_destroy(queryset)
+        except ProtectedError:
+            protected = self.find_protected(queryset)
+            msg = "Object with id %s is referenced by other objects"
+            raise ValidationError(
+                [{"id": [msg % pk]} if pk in protected else {} for pk in ids]
+            )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @staticmethod
+    def find_protected(queryset):
+        """Returns the ids of the objects of ``queryset`` that protected
+        foreign keys keep from being deleted
+        """
+        protected = set()
+        for instance in queryset:
+            try:
+                Collector(using=queryset.db).collect([instance])
+            except ProtectedError:
+                protected.add(instance.pk)
+        return protected
+
+    def perform_bulk_create(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+
+    def perform_bulk_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+
+    def perform_bulk_destroy(self, queryset):
+        with transaction.atomic():
+            queryset.delete()
+
+    def get_bulk_response_data(self, instances):
+        """Serializes written objects, reloading them with eager loading
+        """
+        queryset = self.get_queryset().filter(
+            pk__in=[instance.pk for instance in instances]
+        )
+        return self.get_serializer(queryset, many=True).data
+
+
+class ConditionalGetMixin:
+    """Answers conditional GET requests without serializing the body
+
+    Validators are built from the version tokens the SOR cache keeps for
+    every model, which writes replace, so they cost no queries. Lists carry
+    an ETag built from the tokens of the view model, details an ETag and a
+    Last-Modified date built from the row's ``updated_at``. Both also depend
+    on the tokens of the related resources the serializer renders by name,
+    so renaming an owner changes the validators of its servers.
+    """
+
+    def list(self, request, *args, **kwargs):
+        etag = self.compute_etag(
+            response_cache.get_versions([self.get_queryset().model]),
+            self.get_related_versions(),
+        )
+
+        return self.get_conditional_response(
+            etag, None, super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            updated_at = (
+                self.get_queryset()
+                .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+                .values_list("updated_at", flat=True)
+                .first()
+            )
+        except (TypeError, ValueError, DjangoValidationError):
+            # Lookup values of the wrong type are not found
+            updated_at = None
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        related_versions = self.get_related_versions()
+        etag = self.compute_etag(updated_at, related_versions)
+        last_modified = max(
+            [updated_at]
+            + [
+                response_cache.get_version_time(version)
+                for version in related_versions
+            ]
+        )
+
+        return self.get_conditional_response(
+            etag, last_modified, super().retrieve, request, *args, **kwargs
+        )
+
+    def get_conditional_response(
+        self, etag, last_modified, action, request, *args, **kwargs
+    ):
+        timestamp = None
+        if last_modified is not None:
+            timestamp = int(last_modified.timestamp())
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = action(request, *args, **kwargs)
+
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        return response
+
+    def get_related_versions(self):
+        """Returns the version tokens of every related model rendered by the
+        serializer
+        """
+        return response_cache.get_versions(
+            get_related_models(self.get_serializer_class())
+        )
+
+    def compute_etag(self, *state):
+        """Returns a weak ETag for the given state of the resource, the
+        query string and the rendered format
+        """
+        value = repr(
+            (
+                self.get_queryset().model._meta.label,
+                state,
+                sorted(self.request.query_params.lists()),
+                self.request.accepted_renderer.format,
+            )
+        )
+        return "W/" + quote_etag(hashlib.md5(value.encode()).hexdigest())
+
+
+class ChangesFeedMixin:
+    """Feed of the objects changed and deleted since a cursor
+
+    ``GET <collection>/changes/?since=<cursor>`` returns the objects whose
+    ``updated_at`` moved past the cursor, ordered by ``(updated_at, id)``,
+    the ids of the objects deleted since then, and the cursor to send
+    next. Without ``since`` every object is returned and deletions start
+    from now, which gives the initial full sync.
+
+    ``updated_at`` and ``deleted_at`` are set before the writing transaction
+    commits, so changes younger than ``SOR_CHANGES_SAFETY_SECONDS`` are held
+    back until transactions that started with them had time to commit.
+    Changes committed later than that may still be missed.
+    """
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request, *args, **kwargs):
+        since = self.decode_changes_cursor(request.query_params.get("since"))
+        limit = self.get_changes_limit()
+        model = self.get_queryset().model
+        model_label = model._meta.label_lower
+        settled_at = timezone.now() - timedelta(
+            seconds=settings.SOR_CHANGES_SAFETY_SECONDS
+        )
+        tombstones = Tombstone.objects.filter(
+            model=model_label, deleted_at__lte=settled_at
+        )
+
+        if since is None:
+            last_tombstone = (
+                tombstones.order_by("-id").values_list("id", flat=True).first()
+            )
+            since = {
+                "updated_at": None,
+                "id": 0,
+                "deleted": last_tombstone or 0,
+            }
+
+        queryset = self.get_queryset().filter(updated_at__lte=settled_at)
+        if since["updated_at"] is not None:
+            queryset = queryset.filter(
+                Q(updated_at__gt=since["updated_at"])
+                | Q(updated_at=since["updated_at"], id__gt=since["id"])
+            )
+        changed = list(queryset.order_by("updated_at", "id")[: limit + 1])
+
+        deleted = list(
+            tombstones.filter(id__gt=since["deleted"])
+            .order_by("id")
+            .values("id", "object_id", "deleted_at")[: limit + 1]
+        )
+
+        has_more = len(changed) > limit or len(deleted) > limit
+        changed = changed[:limit]
+        deleted = deleted[:limit]
+
+        if changed:
+            since["updated_at"] = changed[-1].updated_at
+            since["id"] = changed[-1].id
+        if deleted:
+            since["deleted"] = deleted[-1]["id"]
+
+        return Response(
+            {
+                "changed": self.get_serializer(changed, many=True).data,
+                "deleted": [
+                    {"id": item["object_id"], "deleted_at": item["deleted_at"]}
+                    for item in deleted
+                ],
+                "next": self.encode_changes_cursor(since),
+                "has_more": has_more,
+            }
+        )
+
+    def get_changes_limit(self):
+        return SorCursorPagination().get_page_size(self.request)
+
+    @staticmethod
+    def encode_changes_cursor(since):
+        updated_at = since["updated_at"]
+        value = json.dumps(
+            {
+                "updated_at": updated_at and updated_at.isoformat(),
+                "id": since["id"],
+                "deleted": since["deleted"],
+            }
+        )
+        return base64.urlsafe_b64encode(value.encode()).decode()
+
+    @staticmethod
+    def decode_changes_cursor(cursor):
+        if cursor is None:
+            return None
+
+        try:
+            since = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            updated_at = since["updated_at"]
+            if updated_at is not None:
+                since["updated_at"] = parse_datetime(updated_at)
+                if since["updated_at"] is None:
+                    raise ValueError
+            if not isinstance(since["id"], int) or not isinstance(
+                since["deleted"], int
+            ):
+                raise ValueError
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise ValidationError({"since": ["Invalid cursor"]})
+        return since
+
+
+class ExportMixin:
+    """Streams the whole filtered collection
+
+    ``GET <collection>/export/?format=ndjson`` writes one object per line
+    and ``format=json`` a single array. Rows are read in primary key order
+    one chunk at a time, each chunk with its own prefetched relations, so
+    memory stays flat whatever the size of the collection and the first
+    rows are sent before the last ones are read.
+    """
+
+    export_chunk_size = 500
+
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[StreamingJSONRenderer, NDJSONRenderer],
+    )
+    def export(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).order_by("pk")
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        return StreamingHttpResponse(
+            renderer.stream(self.iter_export_rows(queryset)),
+            content_type=content_type,
+        )
+
+    def iter_export_rows(self, queryset):
+        """Yields the serialized rows of ``queryset``, reading and
+        serializing ``export_chunk_size`` objects at a time
+        """
+        chunk = list(queryset[: self.export_chunk_size])
+        while chunk:
+            yield from self.get_serializer(chunk, many=True).data
+            chunk = list(
+                queryset.filter(pk__gt=chunk[-1].pk)[: self.export_chunk_size]
+            )
+
+
+class ResponseCacheMixin:
+    """Serves rendered list and detail responses from the SOR cache
+
+    Responses are keyed on the absolute URL, the rendered format and the
+    version of the view model and of every related model it renders.
+    Signal receivers replace the version of a model when it is written, so
+    renaming an owner retires the cached domains, servers and products.
+    The browsable API, which renders the user, is not cached, and responses
+    that get cached are rendered from the primary database.
+    """
+
+    cached_headers = ["Content-Type", "ETag", "Last-Modified"]
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_cached_response(self, action, request, *args, **kwargs):
+        renderer_format = request.accepted_renderer.format
+        if not response_cache.is_available() or renderer_format == "api":
+            return action(request, *args, **kwargs)
+
+        models = [self.get_queryset().model] + get_related_models(
+            self.get_serializer_class()
+        )
+        key = response_cache.get_key(
+            models, request.build_absolute_uri(), renderer_format
+        )
+
+        cache = response_cache.get_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            return self.build_cached_response(request, cached)
+
+        with primary_pinning(pinned=True):
+            response = action(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+
+            def store(rendered):
+                headers = {
+                    header: rendered[header]
+                    for header in self.cached_headers
+                    if rendered.has_header(header)
+                }
+                cache.set(
+                    key, {"content": rendered.content, "headers": headers}
+                )
+
+            response.add_post_render_callback(store)
+        return response
+
+    def build_cached_response(self, request, cached):
+        headers = cached["headers"]
+
+        last_modified = None
+        if "Last-Modified" in headers:
+            last_modified = parse_http_date_safe(headers["Last-Modified"])
+
+        response = get_conditional_response(
+            request, etag=headers.get("ETag"), last_modified=last_modified
+        )
+        if response is None:
+            response = HttpResponse(cached["content"])
+
+        for header, value in headers.items():
+            response[header] = value
+        return response
@@ -1,6 +1,7 @@
 """Models for sor api app
 """
 from django.db import models
+from django.db.models.functions import Concat
 
 
 class Label(models.Model):
@@ -9,7 +10,7 @@ class Label(models.Model):
 
     name = models.CharField(max_length=25, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Label"
@@ -27,7 +28,7 @@ class Owner(models.Model):
     email = models.EmailField()
     description = models.TextField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Owner"
@@ -44,7 +45,7 @@ class Cluster(models.Model):
     name = models.CharField(max_length=25, unique=True)
     description = models.TextField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Cluster"
@@ -70,7 +71,7 @@ class Environment(models.Model):
     )
     description = models.TextField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Environment"
@@ -99,7 +100,7 @@ class Domain(models.Model):
         max_length=8, choices=Status.choices, default=Status.ACTIVE
     )
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Domain"
@@ -131,7 +132,7 @@ class OperatingSystem(models.Model):
     )
     version = models.CharField(max_length=20)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Operating System"
@@ -141,6 +142,76 @@ class OperatingSystem(models.Model):
         return self.name
 
 
+class ServerQuerySet(models.QuerySet):
+    """Query builders for servers
+
+    Each builder applies the joins, prefetches and annotations its use
+    needs, so they can be chained freely.
+    """
+
+    select_related_fields = ["owner", "domain", "cluster", "operating_system"]
+    prefetch_related_fields = ["environments", "labels"]
+
+    def with_relations(self, fields=None):
+        """Joins the foreign keys and prefetches the many to many relations
+        of a server, or only those named in ``fields``
+        """
+        queryset = self
+        select_related_fields = [
+            field
+            for field in self.select_related_fields
+            if fields is None or field in fields
+        ]
+        prefetch_related_fields = [
+            field
+            for field in self.prefetch_related_fields
+            if fields is None or field in fields
+        ]
+        if select_related_fields:
+            queryset = queryset.select_related(*select_related_fields)
+        if prefetch_related_fields:
+            queryset = queryset.prefetch_related(*prefetch_related_fields)
+        return queryset
+
+    def active(self):
+        return self.filter(status=Server.Status.ACTIVE)
+
+    def in_environment(self, name):
+        # Environment names are unique, so the join can not repeat a server
+        return self.filter(environments__name=name)
+
+    def with_label(self, name):
+        # Label names are unique, so the join can not repeat a server
+        return self.filter(labels__name=name)
+
+    def by_cluster(self, name):
+        return self.filter(cluster__name=name)
+
+    def counts_by(self, field):
+        """Returns the number of servers for each value of ``field``, which
+        may follow relations, as ``{field: value, "count": count}`` rows
+        """
+        return (
+            self.order_by()
+            .values(field)
+            .annotate(count=models.Count("pk", distinct=True))
+            .order_by(field)
+        )
+
+    def with_fqdn(self):
+        """Annotates servers with their fully qualified domain name, which
+        can then be filtered and ordered on
+        """
+        return self.annotate(
+            fqdn=Concat(
+                "name",
+                models.Value("."),
+                "domain__name",
+                output_field=models.CharField(),
+            )
+        )
+
+
 class Server(models.Model):
     """Represents a server running on-prem or cloud
     """
@@ -163,7 +234,10 @@ class Server(models.Model):
         verbose_name="IP Address", unique=True
     )
     category = models.CharField(
-        max_length=5, choices=Category.choices, default=Category.WEB
+        max_length=5,
+        choices=Category.choices,
+        default=Category.WEB,
+        db_index=True,
     )
     owner = models.ForeignKey(
         Owner, related_name="servers", on_delete=models.PROTECT
@@ -188,23 +262,43 @@ class Server(models.Model):
         max_length=8, choices=Status.choices, default=Status.INACTIVE
     )
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = ServerQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Server"
         verbose_name_plural = "Servers"
+        indexes = [
+            models.Index(
+                fields=["status", "category"],
+                name="sor_server_status_category_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # The name or domain may have changed since it was annotated
+        self.__dict__.pop("_fqdn", None)
+
     @property
     def fqdn(self):
-        """Returns fully qualified domain name of server
+        """Returns fully qualified domain name of server, as annotated by
+        ``Server.objects.with_fqdn()`` when it was
         """
+        if "_fqdn" in self.__dict__:
+            return self._fqdn
         return "{name}.{domain}".format(
             name=self.name, domain=self.domain.name
         )
 
+    @fqdn.setter
+    def fqdn(self, value):
+        self._fqdn = value
+
 
 class Product(models.Model):
     """Represents the products hosted in servers
@@ -219,7 +313,7 @@ class Product(models.Model):
     link = models.URLField(null=True, blank=True)
     repository = models.URLField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Product"
@@ -227,3 +321,26 @@ class Product(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class Tombstone(models.Model):
+    """Records the deletion of a SOR resource for the changes feed
+    """
+
+    model = models.CharField(max_length=50)
+    object_id = models.IntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Tombstone"
+        verbose_name_plural = "Tombstones"
+        indexes = [
+            models.Index(
+                fields=["model", "id"], name="sor_tombstone_model_id_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return "{model} {object_id}".format(
+            model=self.model, object_id=self.object_id
+        )
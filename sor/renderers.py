@@ -0,0 +1,40 @@
+"""Renderers for SOR api app
+"""
+
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class StreamingJSONRenderer(JSONRenderer):
+    """JSON renderer that can also stream rows as one JSON array
+    """
+
+    def stream(self, rows):
+        yield b"["
+        separator = b""
+        for row in rows:
+            yield separator + json.dumps(row, cls=JSONEncoder).encode()
+            separator = b","
+        yield b"]"
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Renders a list as newline delimited JSON, one object per line
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if not isinstance(data, list):
+            data = [data]
+        return b"".join(self.stream(data))
+
+    def stream(self, rows):
+        for row in rows:
+            yield json.dumps(row, cls=JSONEncoder).encode() + b"\n"
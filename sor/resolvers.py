@@ -0,0 +1,60 @@
+"""Name resolution for related SOR resources
+"""
+
+from collections import defaultdict
+
+from sor.lookups import get_reference_cache
+
+
+class NameResolver:
+    """Resolves related object names to model instances
+
+    Instances are cached per model for the lifetime of the resolver, so a
+    batch of payloads can be resolved with one ``name__in`` query per model.
+    """
+
+    def __init__(self):
+        self._cache = defaultdict(dict)
+
+    def prime(self, model, names):
+        """Loads every not yet cached name of ``model`` with a single query
+        """
+        cache = self._cache[model]
+        missing = {name for name in names if name not in cache}
+        if not missing:
+            return
+
+        reference = get_reference_cache(model)
+        if reference is not None:
+            for name in list(missing):
+                instance = reference.get_by_name(name)
+                if instance is not None:
+                    cache[name] = instance
+                    missing.discard(name)
+            if not missing:
+                return
+
+        # Names unknown to the reference cache may have been created by
+        # another process, so they are looked up in the database
+        for instance in model._default_manager.filter(name__in=missing):
+            cache[instance.name] = instance
+
+        # Remember unknown names too so they are not queried again
+        for name in missing:
+            cache.setdefault(name, None)
+
+    def resolve(self, model, names):
+        """Returns the instances of ``model`` matching ``names`` in order,
+        along with the names that do not exist
+        """
+        self.prime(model, names)
+        cache = self._cache[model]
+
+        instances = []
+        missing = []
+        for name in dict.fromkeys(names):
+            if cache[name] is None:
+                missing.append(name)
+            else:
+                instances.append(cache[name])
+        return instances, missing
@@ -0,0 +1,20 @@
+"""Routers for SOR api app
+"""
+
+from rest_framework.routers import DefaultRouter
+
+
+class BulkRouter(DefaultRouter):
+    """Router that also maps collection PUT, PATCH and DELETE requests to the
+    bulk actions of a viewset, when the viewset provides them
+    """
+
+    routes = list(DefaultRouter.routes)
+    routes[0] = routes[0]._replace(
+        mapping={
+            **routes[0].mapping,
+            "put": "bulk_update",
+            "patch": "partial_bulk_update",
+            "delete": "bulk_destroy",
+        }
+    )
@@ -0,0 +1,16 @@
+"""Test runner for the SOR api app
+"""
+
+from django.test.runner import DiscoverRunner
+
+
+class SorTestRunner(DiscoverRunner):
+    """Leaves out tests tagged ``benchmark`` unless they are asked for with
+    ``--tag benchmark``
+    """
+
+    def __init__(self, tags=None, exclude_tags=None, **kwargs):
+        exclude_tags = set(exclude_tags or [])
+        if "benchmark" not in (tags or []):
+            exclude_tags.add("benchmark")
+        super().__init__(tags=tags, exclude_tags=exclude_tags, **kwargs)
@@ -0,0 +1,200 @@
+"""Synthetic SOR data for benchmarks and load tests
+"""
+
+import random
+
+from django.db import transaction
+from django.db.models import Max
+
+from sor.db import primary_pinning
+from sor.models import (
+    Label,
+    Owner,
+    Cluster,
+    Environment,
+    Domain,
+    OperatingSystem,
+    Server,
+    Product,
+)
+from sor.signals import bulk_saved
+
+# Servers get addresses in 10.0.0.0/8
+MAX_SERVERS = 1 << 24
+
+
+class SeedError(Exception):
+    pass
+
+
+def create_rows(model, rows, batch_size=None):
+    """Inserts ``rows`` with bulk_create and returns their ids, in order
+
+    SQLite does not return the ids of bulk inserted rows, so they are read
+    back by name from the rows past the highest id found beforehand.
+    """
+    last_id = model.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+    model.objects.bulk_create(rows, batch_size=batch_size)
+    bulk_saved.send(sender=model, instances=rows)
+
+    ids = dict(
+        model.objects.filter(id__gt=last_id)
+        .values_list("name", "id")
+        .iterator()
+    )
+    return [ids[row.name] for row in rows]
+
+
+def create_relations(field, pairs, batch_size=None):
+    """Inserts the ``(server id, related id)`` ``pairs`` of the many to many
+    ``field`` of Server straight into its through table
+    """
+    through = field.remote_field.through
+    source = field.m2m_field_name()
+    target = field.m2m_reverse_field_name()
+    through.objects.bulk_create(
+        [
+            through(**{"%s_id" % source: left, "%s_id" % target: right})
+            for left, right in pairs
+        ],
+        batch_size=batch_size,
+    )
+
+
+def seed_sor(servers, seed=0, batch_size=None, chunk_size=10000):
+    """Creates ``servers`` servers along with owners, domains, clusters,
+    environments, operating systems, labels and products in proportion
+
+    The rows only depend on ``servers`` and ``seed``, and are written with
+    bulk inserts, many to many relations included, ``chunk_size`` servers
+    at a time and in a single transaction.
+    """
+    if not 0 < servers <= MAX_SERVERS:
+        raise SeedError("Between 1 and %d servers can be seeded" % MAX_SERVERS)
+
+    rng = random.Random(seed)
+    with primary_pinning(pinned=True), transaction.atomic():
+        if Server.objects.exists():
+            raise SeedError("The database already holds servers")
+
+        owner_ids = create_rows(
+            Owner,
+            [
+                Owner(
+                    name="owner%d" % index, email="owner%d@example.com" % index
+                )
+                for index in range(max(1, servers // 100))
+            ],
+            batch_size,
+        )
+        domain_ids = create_rows(
+            Domain,
+            [
+                Domain(
+                    name="domain%d.example.com" % index,
+                    owner_id=rng.choice(owner_ids),
+                )
+                for index in range(max(1, servers // 50))
+            ],
+            batch_size,
+        )
+        cluster_ids = create_rows(
+            Cluster,
+            [
+                Cluster(name="cluster%d" % index)
+                for index in range(max(1, servers // 200))
+            ],
+            batch_size,
+        )
+        environment_ids = create_rows(
+            Environment,
+            [
+                Environment(name="%s%d" % (category, index), category=category)
+                for index in range(2)
+                for category in Environment.Category.values
+            ],
+            batch_size,
+        )
+        operating_system_ids = create_rows(
+            OperatingSystem,
+            [
+                OperatingSystem(
+                    name="%s %d" % (family, index),
+                    family=family,
+                    version=index,
+                )
+                for index in range(3)
+                for family in OperatingSystem.Family.values
+            ],
+            batch_size,
+        )
+        label_ids = create_rows(
+            Label,
+            [Label(name="label%d" % index) for index in range(20)],
+            batch_size,
+        )
+        create_rows(
+            Product,
+            [
+                Product(
+                    name="product%d" % index,
+                    port=rng.randrange(1024, 65536),
+                    version="1.%d" % (index % 10),
+                    owner_id=rng.choice(owner_ids),
+                )
+                for index in range(max(1, servers // 20))
+            ],
+            batch_size,
+        )
+
+        # About one server in ten is outside of any cluster
+        cluster_choices = cluster_ids + [None] * max(1, len(cluster_ids) // 9)
+        categories = Server.Category.values
+        statuses = Server.Status.values
+
+        # Separate streams keep the rows independent of the chunk size
+        server_rng, environment_rng, label_rng = (
+            random.Random(rng.getrandbits(64)) for _ in range(3)
+        )
+        for start in range(0, servers, chunk_size):
+            indexes = range(start, min(start + chunk_size, servers))
+            server_ids = create_rows(
+                Server,
+                [
+                    Server(
+                        name="server%d" % index,
+                        ip_address="10.%d.%d.%d"
+                        % (index >> 16 & 255, index >> 8 & 255, index & 255),
+                        category=server_rng.choice(categories),
+                        status=server_rng.choice(statuses),
+                        owner_id=server_rng.choice(owner_ids),
+                        domain_id=server_rng.choice(domain_ids),
+                        cluster_id=server_rng.choice(cluster_choices),
+                        operating_system_id=server_rng.choice(
+                            operating_system_ids
+                        ),
+                    )
+                    for index in indexes
+                ],
+                batch_size,
+            )
+            create_relations(
+                Server._meta.get_field("environments"),
+                [
+                    (server_id, environment_id)
+                    for index, server_id in zip(indexes, server_ids)
+                    for environment_id in environment_rng.sample(
+                        environment_ids, 1 + index % 2
+                    )
+                ],
+                batch_size,
+            )
+            create_relations(
+                Server._meta.get_field("labels"),
+                [
+                    (server_id, label_id)
+                    for index, server_id in zip(indexes, server_ids)
+                    for label_id in label_rng.sample(label_ids, index % 4)
+                ],
+                batch_size,
+            )
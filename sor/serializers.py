@@ -1,6 +1,11 @@
 """Serializers for SOR api app models
 """
+from django.db import connection
+from django.db.models import Prefetch
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.fields import BooleanField
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.utils import model_meta
 from rest_framework.exceptions import ValidationError
 
@@ -12,11 +17,29 @@ from sor.models import (
     Domain,
     OperatingSystem,
     Server,
+    ServerQuerySet,
     Product,
 )
+from sor.lookups import get_reference_cache
+from sor.resolvers import NameResolver
+from sor.signals import bulk_saved
+
+TRUE_VALUES = BooleanField.TRUE_VALUES
 
 
 class ManyToOneRelatedField(serializers.Field):
+    def get_attribute(self, instance):
+        # Reference rows are read from the in-process cache by id, which
+        # avoids loading them with the instance
+        field = instance._meta.get_field(self.source)
+        reference = get_reference_cache(field.related_model)
+        if reference is not None and not field.is_cached(instance):
+            pk = getattr(instance, field.attname)
+            related = None if pk is None else reference.get_by_id(pk)
+            if pk is None or related is not None:
+                return related
+        return super().get_attribute(instance)
+
     def to_representation(self, related_field):
         return related_field.name
 
@@ -35,8 +58,15 @@ class ManyToOneRelatedField(serializers.Field):
 
 
 class ManyToManyRelatedField(serializers.Field):
-    def to_representation(self, related_field):
-        return [item.name for item in related_field.all()]
+    def get_attribute(self, instance):
+        # Relations may be prefetched into a list instead of the manager
+        prefetched = instance.__dict__.get("prefetched_%s" % self.source)
+        if prefetched is not None:
+            return prefetched
+        return super().get_attribute(instance).all()
+
+    def to_representation(self, related):
+        return [item.name for item in related]
 
     def to_internal_value(self, data):
         if not isinstance(data, list):
@@ -54,24 +84,425 @@ class ManyToManyRelatedField(serializers.Field):
         return data
 
 
-class LabelSerializer(serializers.ModelSerializer):
+def get_related_models(serializer_class):
+    """Returns the models a serializer renders by name
+
+    Responses of sparse fieldsets depend on all of them too: annotations
+    such as ``fqdn`` and filters on related names read their tables.
+    """
+    model = serializer_class.Meta.model
+
+    related_models = []
+    for field_name, field in serializer_class._declared_fields.items():
+        if isinstance(field, (ManyToOneRelatedField, ManyToManyRelatedField)):
+            field_name = field.source or field_name
+            related_models.append(
+                model._meta.get_field(field_name).related_model
+            )
+    return related_models
+
+
+class SparseFieldsetMixin:
+    """Lets clients of safe requests choose the rendered fields
+
+    ``?fields=`` lists the fields to render, ``?omit=`` the fields to leave
+    out and ``?compact=true`` selects ``Meta.compact_fields``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return
+
+        field_names = self.get_requested_fields(request.query_params)
+        if field_names is not None:
+            for field_name in set(self.fields) - field_names:
+                self.fields.pop(field_name)
+
+    @classmethod
+    def get_requested_fields(cls, query_params):
+        """Returns the names of the requested fields, or None for all
+        """
+        all_fields = cls.Meta.fields
+        compact_fields = getattr(cls.Meta, "compact_fields", None)
+
+        if compact_fields and query_params.get("compact") in TRUE_VALUES:
+            selected = compact_fields
+        elif "fields" in query_params:
+            selected = query_params["fields"].split(",")
+        else:
+            selected = all_fields
+        omitted = query_params.get("omit", "").split(",")
+
+        field_names = {
+            field_name
+            for field_name in all_fields
+            if field_name in selected and field_name not in omitted
+        }
+        if len(field_names) == len(all_fields):
+            return None
+        return field_names
+
+
+class EagerLoadingSerializerMixin:
+    """Declares the relations a serializer renders so that views can load
+    them up front instead of issuing one query per row.
+    """
+
+    select_related_fields = []
+    prefetch_related_fields = []
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, field_names=None):
+        """Loads the relations of ``field_names``, or of every field
+        """
+        select_related_fields = [
+            field_name
+            for field_name in cls.select_related_fields
+            if field_names is None or field_name in field_names
+        ]
+        prefetch_related_fields = [
+            field_name
+            for field_name in cls.prefetch_related_fields
+            if field_names is None or field_name in field_names
+        ]
+
+        # Relations served by the reference cache need no join
+        select_related_fields = [
+            field_name
+            for field_name in select_related_fields
+            if get_reference_cache(
+                queryset.model._meta.get_field(field_name).related_model
+            )
+            is None
+        ]
+
+        # Models with a query builder for their relations join them with it
+        with_relations = getattr(queryset, "with_relations", None)
+        if with_relations is not None:
+            queryset = with_relations(select_related_fields)
+        elif select_related_fields:
+            queryset = queryset.select_related(*select_related_fields)
+
+        if prefetch_related_fields:
+            # Prefetching into lists, which ManyToManyRelatedField reads,
+            # skips the queryset Django 3.0 builds for the prefetch cache
+            # of every row
+            queryset = queryset.prefetch_related(
+                *[
+                    Prefetch(field_name, to_attr="prefetched_%s" % field_name)
+                    for field_name in prefetch_related_fields
+                ]
+            )
+        return queryset
+
+
+class NameResolverMixin:
+    """Provides a NameResolver shared by every serializer of a request
+    """
+
+    @property
+    def resolver(self):
+        return self.context.setdefault("resolver", NameResolver())
+
+    def resolve_names(self, model, names):
+        """Returns the instances named ``names``, reporting every missing
+        name at once
+        """
+        instances, missing = self.resolver.resolve(model, names)
+        if missing:
+            raise ValidationError(
+                [
+                    "%s %s matching query does not exist"
+                    % (model.__name__, name)
+                    for name in missing
+                ]
+            )
+        return instances
+
+    def resolve_name(self, model, name):
+        return self.resolve_names(model, [name])[0]
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """Validates and writes a batch of objects in set based queries
+
+    Related names of the whole batch are resolved up front, rows are
+    written with ``bulk_create``/``bulk_update`` and many to many relations
+    with bulk inserts on the through tables.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            msg = "Incorrect Type. Expected a list but got %s" % (
+                type(data).__name__
+            )
+            raise ValidationError({"non_field_errors": [msg]})
+
+        if not self.allow_empty and len(data) == 0:
+            msg = "This list may not be empty."
+            raise ValidationError({"non_field_errors": [msg]})
+
+        self.prime_resolver(data)
+
+        instances = {}
+        if self.instance is not None:
+            instances = {instance.pk: instance for instance in self.instance}
+
+        model = self.child.Meta.model
+        unique_fields = [
+            field.name
+            for field in model._meta.concrete_fields
+            if field.unique and not field.primary_key
+        ]
+        seen = {field_name: set() for field_name in unique_fields}
+        seen_ids = set()
+
+        ret = []
+        errors = []
+
+        for item in data:
+            instance = None
+            if self.instance is not None:
+                item_id = item.get("id") if isinstance(item, dict) else None
+                # Booleans are ints too, and True would find the id 1
+                if type(item_id) is not int:
+                    msg = "Incorrect Type. Expected an integer id"
+                    errors.append({"id": [msg]})
+                    continue
+                instance = instances.get(item_id)
+                if instance is None:
+                    msg = "Object with id %s does not exist" % item_id
+                    errors.append({"id": [msg]})
+                    continue
+                if item_id in seen_ids:
+                    msg = "id %s is duplicated in this request" % item_id
+                    errors.append({"id": [msg]})
+                    continue
+                seen_ids.add(item_id)
+
+            # Unique validators exclude the instance being updated
+            self.child.instance = instance
+            try:
+                validated = self.child.run_validation(item)
+            except ValidationError as exc:
+                errors.append(exc.detail)
+            else:
+                duplicates = self.find_duplicates(validated, seen)
+                if duplicates:
+                    errors.append(duplicates)
+                    continue
+
+                if instance is not None:
+                    validated["id"] = instance.pk
+                ret.append(validated)
+                errors.append({})
+        self.child.instance = None
+
+        if any(errors):
+            raise ValidationError(errors)
+
+        return ret
+
+    @staticmethod
+    def find_duplicates(validated, seen):
+        """Reports unique values already used by another item of the batch
+        """
+        duplicates = {}
+        for field_name, values in seen.items():
+            if field_name not in validated:
+                continue
+
+            value = validated[field_name]
+            if value in values:
+                msg = "%s %s is duplicated in this request" % (
+                    field_name,
+                    value,
+                )
+                duplicates[field_name] = [msg]
+            values.add(value)
+        return duplicates
+
+    def prime_resolver(self, data):
+        """Resolves the related names of every item with one query per model
+        """
+        resolver = getattr(self.child, "resolver", None)
+        if resolver is None:
+            return
+
+        model = self.child.Meta.model
+        for field_name, field in self.child.fields.items():
+            if not isinstance(
+                field, (ManyToOneRelatedField, ManyToManyRelatedField)
+            ):
+                continue
+
+            names = set()
+            for item in data:
+                if not isinstance(item, dict):
+                    continue
+                value = item.get(field_name)
+                if isinstance(value, str):
+                    names.add(value)
+                elif isinstance(value, list):
+                    names.update(
+                        name for name in value if isinstance(name, str)
+                    )
+
+            related_model = model._meta.get_field(field.source).related_model
+            resolver.prime(related_model, names)
+
+    def create(self, validated_data):
+        ModelClass = self.child.Meta.model
+        info = model_meta.get_field_info(ModelClass)
+
+        instances = []
+        many_to_many = []
+
+        for attrs in validated_data:
+            relations = {}
+            for field_name, relation_info in info.relations.items():
+                if relation_info.to_many and (field_name in attrs):
+                    relations[field_name] = attrs.pop(field_name)
+            instances.append(ModelClass(**attrs))
+            many_to_many.append(relations)
+
+        self.bulk_create(ModelClass, instances)
+        bulk_saved.send(sender=ModelClass, instances=instances)
+
+        for instance, relations in zip(instances, many_to_many):
+            instance._pending_many_to_many = relations
+        self.bulk_set_many_to_many(ModelClass, instances, replace=False)
+
+        return instances
+
+    def update(self, instance, validated_data):
+        ModelClass = self.child.Meta.model
+        info = model_meta.get_field_info(ModelClass)
+        instances = {obj.pk: obj for obj in instance}
+
+        updated = []
+        update_fields = set()
+        now = timezone.now()
+
+        for attrs in validated_data:
+            obj = instances[attrs.pop("id")]
+            relations = {}
+
+            for attr, value in attrs.items():
+                if attr in info.relations and info.relations[attr].to_many:
+                    relations[attr] = value
+                else:
+                    setattr(obj, attr, value)
+                    update_fields.add(attr)
+
+            # bulk_update bypasses pre_save, so auto_now is applied here
+            for field in ModelClass._meta.concrete_fields:
+                if getattr(field, "auto_now", False):
+                    setattr(obj, field.attname, now)
+                    update_fields.add(field.name)
+
+            obj._pending_many_to_many = relations
+            updated.append(obj)
+
+        if update_fields:
+            ModelClass._default_manager.bulk_update(
+                updated, sorted(update_fields)
+            )
+            bulk_saved.send(sender=ModelClass, instances=updated)
+        self.bulk_set_many_to_many(ModelClass, updated, replace=True)
+
+        return updated
+
+    @staticmethod
+    def bulk_create(model, instances):
+        """Inserts ``instances`` and makes sure their primary keys are set
+        """
+        if connection.features.can_return_rows_from_bulk_insert:
+            model._default_manager.bulk_create(instances)
+            return
+
+        unique_field = next(
+            (
+                field
+                for field in model._meta.concrete_fields
+                if field.unique and not field.primary_key
+            ),
+            None,
+        )
+        if unique_field is None:
+            for instance in instances:
+                instance.save()
+            return
+
+        model._default_manager.bulk_create(instances)
+        values = [
+            getattr(instance, unique_field.attname) for instance in instances
+        ]
+        pks = dict(
+            model._default_manager.filter(
+                **{"%s__in" % unique_field.attname: values}
+            ).values_list(unique_field.attname, "pk")
+        )
+        for instance in instances:
+            instance.pk = pks[getattr(instance, unique_field.attname)]
+
+    @staticmethod
+    def bulk_set_many_to_many(model, instances, replace):
+        """Writes pending many to many values with bulk through table inserts
+        """
+        for field in model._meta.many_to_many:
+            targets = {
+                instance.pk: instance._pending_many_to_many[field.name]
+                for instance in instances
+                if field.name in instance._pending_many_to_many
+            }
+            if not targets:
+                continue
+
+            through = field.remote_field.through
+            source = field.m2m_column_name()
+            target = field.m2m_reverse_name()
+
+            if replace:
+                through._default_manager.filter(
+                    **{"%s__in" % source: list(targets)}
+                ).delete()
+
+            through._default_manager.bulk_create(
+                [
+                    through(**{source: pk, target: related_pk})
+                    for pk, values in targets.items()
+                    for related_pk in {value.pk for value in values}
+                ]
+            )
+
+        for instance in instances:
+            del instance._pending_many_to_many
+
+
+class LabelSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializes Label model
     """
 
     class Meta:
         model = Label
+        list_serializer_class = BulkListSerializer
         fields = [
             "id",
             "name",
         ]
 
 
-class OwnerSerializer(serializers.ModelSerializer):
+class OwnerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializes Owner model
     """
 
     class Meta:
         model = Owner
+        list_serializer_class = BulkListSerializer
         fields = [
             "id",
             "name",
@@ -80,12 +511,13 @@ class OwnerSerializer(serializers.ModelSerializer):
         ]
 
 
-class ClusterSerializer(serializers.ModelSerializer):
+class ClusterSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializes Cluster model
     """
 
     class Meta:
         model = Cluster
+        list_serializer_class = BulkListSerializer
         fields = [
             "id",
             "name",
@@ -93,12 +525,13 @@ class ClusterSerializer(serializers.ModelSerializer):
         ]
 
 
-class EnvironmentSerializer(serializers.ModelSerializer):
+class EnvironmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializes Environment model
     """
 
     class Meta:
         model = Environment
+        list_serializer_class = BulkListSerializer
         fields = [
             "id",
             "name",
@@ -107,14 +540,22 @@ class EnvironmentSerializer(serializers.ModelSerializer):
         ]
 
 
-class DomainSerializer(serializers.ModelSerializer):
+class DomainSerializer(
+    NameResolverMixin,
+    SparseFieldsetMixin,
+    EagerLoadingSerializerMixin,
+    serializers.ModelSerializer,
+):
     """Serializes Domain model
     """
 
     owner = ManyToOneRelatedField()
 
+    select_related_fields = ["owner"]
+
     class Meta:
         model = Domain
+        list_serializer_class = BulkListSerializer
         fields = [
             "id",
             "name",
@@ -136,20 +577,18 @@ class DomainSerializer(serializers.ModelSerializer):
         return instance
 
     def validate_owner(self, value):
-        try:
-            owner = Owner.objects.get(name=value)
-        except Owner.DoesNotExist:
-            msg = "Owner %s matching query does not exist" % value
-            raise ValidationError([msg])
-        return owner
+        return self.resolve_name(Owner, value)
 
 
-class OperatingSystemSerializer(serializers.ModelSerializer):
+class OperatingSystemSerializer(
+    SparseFieldsetMixin, serializers.ModelSerializer
+):
     """Serializes OperatingSystem model
     """
 
     class Meta:
         model = OperatingSystem
+        list_serializer_class = BulkListSerializer
         fields = [
             "id",
             "name",
@@ -159,7 +598,12 @@ class OperatingSystemSerializer(serializers.ModelSerializer):
         ]
 
 
-class ServerSerializer(serializers.ModelSerializer):
+class ServerSerializer(
+    NameResolverMixin,
+    SparseFieldsetMixin,
+    EagerLoadingSerializerMixin,
+    serializers.ModelSerializer,
+):
     """Serializes Server model
     """
 
@@ -169,12 +613,18 @@ class ServerSerializer(serializers.ModelSerializer):
     environments = ManyToManyRelatedField()
     operating_system = ManyToOneRelatedField()
     labels = ManyToManyRelatedField()
+    fqdn = serializers.CharField(read_only=True)
+
+    select_related_fields = ServerQuerySet.select_related_fields
+    prefetch_related_fields = ServerQuerySet.prefetch_related_fields
 
     class Meta:
         model = Server
+        list_serializer_class = BulkListSerializer
         fields = [
             "id",
             "name",
+            "fqdn",
             "ip_address",
             "category",
             "owner",
@@ -186,6 +636,7 @@ class ServerSerializer(serializers.ModelSerializer):
             "description",
             "status",
         ]
+        compact_fields = ["id", "name", "ip_address", "status"]
 
     def create(self, validated_data):
         ModelClass = self.Meta.model
@@ -224,77 +675,45 @@ class ServerSerializer(serializers.ModelSerializer):
         for attr, value in many_to_many_fields:
             field = getattr(instance, attr)
             field.set(value)
+            instance.__dict__.pop("prefetched_%s" % attr, None)
 
         return instance
 
     def validate_owner(self, value):
-        try:
-            owner = Owner.objects.get(name=value)
-        except Owner.DoesNotExist:
-            msg = "Owner %s matching query does not exist" % value
-            raise ValidationError([msg])
-        return owner
+        return self.resolve_name(Owner, value)
 
     def validate_domain(self, value):
-        try:
-            domain = Domain.objects.get(name=value)
-        except Domain.DoesNotExist:
-            msg = "Domain %s matching query does not exist" % value
-            raise ValidationError([msg])
-        return domain
+        return self.resolve_name(Domain, value)
 
     def validate_cluster(self, value):
-        try:
-            cluster = Cluster.objects.get(name=value)
-        except Cluster.DoesNotExist:
-            msg = "Cluster %s matching query does not exist" % value
-            raise ValidationError([msg])
-        return cluster
+        return self.resolve_name(Cluster, value)
 
     def validate_environments(self, value):
-        environments = []
-
-        for environment_name in value:
-            try:
-                environments.append(
-                    Environment.objects.get(name=environment_name)
-                )
-            except Environment.DoesNotExist:
-                msg = (
-                    "Environment %s matching query does not exist"
-                    % environment_name
-                )
-                raise ValidationError([msg])
-        return environments
+        return self.resolve_names(Environment, value)
 
     def validate_operating_system(self, value):
-        try:
-            operating_system = OperatingSystem.objects.get(name=value)
-        except OperatingSystem.DoesNotExist:
-            msg = "OperatingSystem %s matching query does not exist" % value
-            raise ValidationError([msg])
-        return operating_system
+        return self.resolve_name(OperatingSystem, value)
 
     def validate_labels(self, value):
-        labels = []
-
-        for label_name in value:
-            try:
-                labels.append(Label.objects.get(name=label_name))
-            except Label.DoesNotExist:
-                msg = "Label %s matching query does not exist" % label_name
-                raise ValidationError([msg])
-        return labels
+        return self.resolve_names(Label, value)
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(
+    NameResolverMixin,
+    SparseFieldsetMixin,
+    EagerLoadingSerializerMixin,
+    serializers.ModelSerializer,
+):
     """Serializes Product model
     """
 
     owner = ManyToOneRelatedField()
 
+    select_related_fields = ["owner"]
+
     class Meta:
         model = Product
+        list_serializer_class = BulkListSerializer
         fields = [
             "id",
             "name",
@@ -317,9 +736,4 @@ class ProductSerializer(serializers.ModelSerializer):
         return instance
 
     def validate_owner(self, value):
-        try:
-            owner = Owner.objects.get(name=value)
-        except Owner.DoesNotExist:
-            msg = "Owner %s matching query does not exist" % value
-            raise ValidationError([msg])
-        return owner
+        return self.resolve_name(Owner, value)
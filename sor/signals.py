@@ -0,0 +1,93 @@
+"""Signals for SOR api app
+"""
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal
+
+from sor import cache as response_cache
+from sor.lookups import REFERENCE_CACHES
+from sor.models import (
+    Label,
+    Owner,
+    Cluster,
+    Environment,
+    Domain,
+    OperatingSystem,
+    Server,
+    Product,
+    Tombstone,
+)
+
+# Sent with the written ``instances`` after rows are saved with bulk_create
+# or bulk_update, which do not send post_save
+bulk_saved = Signal()
+
+# Models whose deletions are recorded for the changes feed
+TRACKED_MODELS = [
+    Label,
+    Owner,
+    Cluster,
+    Environment,
+    Domain,
+    OperatingSystem,
+    Server,
+    Product,
+]
+
+
+def invalidate_reference_cache(sender, **kwargs):
+    reference = REFERENCE_CACHES[sender]
+
+    # Invalidate again once committed, in case another thread reloaded the
+    # rows before the write became visible
+    reference.invalidate()
+    transaction.on_commit(reference.invalidate)
+
+
+def invalidate_response_cache(sender, **kwargs):
+    response_cache.invalidate(sender)
+    transaction.on_commit(lambda: response_cache.invalidate(sender))
+
+
+def invalidate_response_cache_on_m2m(sender, instance, model, **kwargs):
+    # Both sides render the relation
+    for changed in (type(instance), model):
+        invalidate_response_cache(changed)
+
+
+def record_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(
+        model=sender._meta.label_lower, object_id=instance.pk
+    )
+
+
+# Receivers are connected per sender, so models without receivers keep
+# Django's fast delete path
+for model in REFERENCE_CACHES:
+    for signal in (post_save, post_delete, bulk_saved):
+        signal.connect(
+            invalidate_reference_cache,
+            sender=model,
+            dispatch_uid="sor_reference_cache",
+        )
+
+for model in TRACKED_MODELS:
+    post_delete.connect(
+        record_tombstone, sender=model, dispatch_uid="sor_tombstone"
+    )
+
+for model in TRACKED_MODELS:
+    for signal in (post_save, post_delete, bulk_saved):
+        signal.connect(
+            invalidate_response_cache,
+            sender=model,
+            dispatch_uid="sor_response_cache",
+        )
+
+    for field in model._meta.many_to_many:
+        m2m_changed.connect(
+            invalidate_response_cache_on_m2m,
+            sender=field.remote_field.through,
+            dispatch_uid="sor_response_cache",
+        )
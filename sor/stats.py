@@ -0,0 +1,60 @@
+"""Dashboard statistics for SOR api app
+"""
+
+from sor.models import (
+    Label,
+    Owner,
+    Cluster,
+    Environment,
+    Domain,
+    OperatingSystem,
+    Server,
+    Product,
+)
+
+# Models statistics are computed from, whose writes retire cached ones
+STATS_MODELS = [
+    Label,
+    Owner,
+    Cluster,
+    Environment,
+    Domain,
+    OperatingSystem,
+    Server,
+    Product,
+]
+
+# Server breakdowns, by the field each one groups on
+SERVER_GROUPS = {
+    "by_status": "status",
+    "by_category": "category",
+    "by_environment": "environments__name",
+    "by_os_family": "operating_system__family",
+    "by_owner": "owner__name",
+    "by_cluster": "cluster__name",
+}
+
+
+def build_stats():
+    """Returns the number of resources of each type and of servers grouped
+    by status, category, environment, operating system family, owner and
+    cluster, with one grouped query per breakdown
+    """
+    servers = {}
+    for name, field in SERVER_GROUPS.items():
+        servers[name] = {
+            row[field]: row["count"]
+            for row in Server.objects.counts_by(field)
+            if row[field] is not None
+        }
+    servers["total"] = sum(servers["by_status"].values())
+
+    totals = {
+        model._meta.verbose_name_plural.lower().replace(" ", "_"): (
+            model._default_manager.count()
+        )
+        for model in STATS_MODELS
+        if model is not Server
+    }
+    totals["servers"] = servers["total"]
+    return {"servers": servers, "totals": totals}
@@ -0,0 +1,101 @@
+"""Test cases for sor benchmarks
+"""
+
+import os
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, override_settings, tag
+from rest_framework.test import APITransactionTestCase
+
+from sor.benchmarks import (
+    BENCHMARK_CACHES,
+    check_budgets,
+    get_percentile,
+    invalidate_reference_caches,
+    run_benchmarks,
+)
+from sor.seed import seed_sor
+
+
+class BudgetTestCase(SimpleTestCase):
+    def test_get_percentile(self):
+        timings = list(range(100, 0, -1))
+        self.assertEqual(get_percentile(timings, 50), 50)
+        self.assertEqual(get_percentile(timings, 95), 95)
+        self.assertEqual(get_percentile([7], 99), 7)
+
+    def test_check_budgets(self):
+        results = [
+            {
+                "endpoint": "server",
+                "operation": "list",
+                "p95_ms": 30.04,
+                "queries": 4,
+            },
+            {
+                "endpoint": "label",
+                "operation": "list",
+                "p95_ms": 30.04,
+                "queries": 4,
+            },
+        ]
+        budgets = {
+            "list": {"queries": 5, "p95_ms": 20},
+            "server.list": {"queries": 3},
+        }
+        self.assertEqual(
+            check_budgets(results, budgets),
+            [
+                "server list: queries is 4, over the budget of 3",
+                "server list: p95_ms is 30.0, over the budget of 20",
+                "label list: p95_ms is 30.0, over the budget of 20",
+            ],
+        )
+        self.assertEqual(
+            check_budgets(results, budgets, latency=False),
+            ["server list: queries is 4, over the budget of 3"],
+        )
+
+
+@override_settings(CACHES=BENCHMARK_CACHES)
+class BenchmarkTestCase(APITransactionTestCase):
+    """Runs outside of a transaction, where the reference caches are used
+    like they are in production
+    """
+
+    scale = 50
+    requests = 3
+
+    def setUp(self):
+        invalidate_reference_caches()
+        self.addCleanup(invalidate_reference_caches)
+        seed_sor(self.scale)
+        self.client.force_authenticate(
+            user=User.objects.create_user("benchmark")
+        )
+
+    def test_query_budgets(self):
+        results = run_benchmarks(self.client, self.requests)
+        self.assertEqual(
+            check_budgets(
+                results, settings.SOR_BENCHMARK_BUDGETS, latency=False
+            ),
+            [],
+        )
+
+
+@tag("benchmark")
+class LatencyBenchmarkTestCase(BenchmarkTestCase):
+    """Run with ``manage.py test --tag benchmark``, at the scale of
+    SOR_BENCHMARK_SCALE servers
+    """
+
+    scale = int(os.environ.get("SOR_BENCHMARK_SCALE", 1000))
+    requests = 20
+
+    def test_latency_budgets(self):
+        results = run_benchmarks(self.client, self.requests)
+        self.assertEqual(
+            check_budgets(results, settings.SOR_BENCHMARK_BUDGETS), []
+        )
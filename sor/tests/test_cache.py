@@ -0,0 +1,201 @@
+"""Test cases for sor response cache
+"""
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from sor.cache import get_cache
+from sor.lookups import REFERENCE_CACHES
+from sor.models import (
+    Label,
+    Owner,
+    Cluster,
+    Environment,
+    Domain,
+    OperatingSystem,
+    Server,
+)
+from sor.serializers import ServerSerializer
+
+
+class ResponseCacheTestCase(APITransactionTestCase):
+    """Tests run outside of a transaction, where the cache is used
+    """
+
+    def setUp(self):
+        get_cache().clear()
+        for reference in REFERENCE_CACHES.values():
+            reference.invalidate()
+
+        self.url = reverse("server-list")
+        self.owner_instance = Owner.objects.create(
+            name="OWNERA", email="owner@example.com", description="A owner"
+        )
+        self.domain_instance = Domain.objects.create(
+            name="domain.a", owner=self.owner_instance
+        )
+        self.os_instance = OperatingSystem.objects.create(
+            name="CENT OS", version="8.0"
+        )
+        self.label_instance = Label.objects.create(name="test")
+        self.model_instance = Server.objects.create(
+            name="testserverd1",
+            ip_address="127.0.0.1",
+            owner=self.owner_instance,
+            domain=self.domain_instance,
+            cluster=Cluster.objects.create(name="CLUSTERA"),
+            operating_system=self.os_instance,
+        )
+        self.model_instance.environments.add(
+            Environment.objects.create(name="ENVA")
+        )
+
+    def test_get_servers_from_cache(self):
+        response = self.client.get(self.url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.url, format="json")
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached["ETag"], response["ETag"])
+
+    def test_get_server_from_cache(self):
+        url = f"{self.url}{self.model_instance.id}/"
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, format="json")
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached["Last-Modified"], response["Last-Modified"])
+
+    def test_cache_is_keyed_on_query_params(self):
+        self.client.get(self.url, format="json")
+        response = self.client.get(
+            self.url, {"status": "ACTIVE"}, format="json"
+        )
+        self.assertEqual(response.json()["results"], [])
+
+    def test_cached_response_not_modified(self):
+        response = self.client.get(self.url, format="json")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.url, format="json", HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_cache_is_invalidated_on_related_rename(self):
+        self.client.get(self.url, format="json")
+
+        self.owner_instance.name = "OWNERB"
+        self.owner_instance.save()
+
+        response = self.client.get(self.url, format="json")
+        self.assertEqual(response.json()["results"][0]["owner"], "OWNERB")
+
+    def test_cache_is_invalidated_on_m2m_change(self):
+        self.client.get(self.url, format="json")
+
+        self.label_instance.servers.add(self.model_instance)
+
+        response = self.client.get(self.url, format="json")
+        self.assertEqual(response.json()["results"][0]["labels"], ["test"])
+
+    def test_sparse_response_is_invalidated_on_related_rename(self):
+        params = {"fields": "name,fqdn"}
+        response = self.client.get(self.url, params, format="json")
+        self.assertEqual(
+            response.json()["results"][0]["fqdn"], "testserverd1.domain.a"
+        )
+        etag = response["ETag"]
+
+        self.domain_instance.name = "domain.b"
+        self.domain_instance.save()
+
+        response = self.client.get(
+            self.url, params, format="json", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(
+            response.json()["results"][0]["fqdn"], "testserverd1.domain.b"
+        )
+
+    def test_get_inventory_from_cache(self):
+        url = reverse("server-inventory")
+        response = self.client.get(url, format="json")
+        self.assertNotIn("label_test", response.json())
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, format="json")
+        self.assertEqual(cached.json(), response.json())
+
+        self.label_instance.servers.add(self.model_instance)
+
+        response = self.client.get(url, format="json")
+        self.assertEqual(
+            response.json()["label_test"], {"hosts": ["testserverd1.domain.a"]}
+        )
+
+    def test_filtered_inventory_is_invalidated_on_owner_rename(self):
+        url = reverse("server-inventory")
+        response = self.client.get(url, {"owner": "OWNERA"}, format="json")
+        self.assertEqual(
+            response.json()["all"]["hosts"], ["testserverd1.domain.a"]
+        )
+
+        self.owner_instance.name = "OWNERB"
+        self.owner_instance.save()
+
+        response = self.client.get(url, {"owner": "OWNERA"}, format="json")
+        self.assertEqual(response.json()["all"]["hosts"], [])
+
+    def test_get_stats_from_cache(self):
+        url = reverse("stats")
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.json()["servers"]["total"], 1)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, format="json")
+        self.assertEqual(cached.json(), response.json())
+
+        self.model_instance.status = "ACTIVE"
+        self.model_instance.save()
+
+        response = self.client.get(url, format="json")
+        self.assertEqual(
+            response.json()["servers"]["by_status"], {"ACTIVE": 1}
+        )
+
+    def test_cache_is_invalidated_on_bulk_save(self):
+        self.client.get(self.url, format="json")
+
+        data = [
+            {
+                "name": "testserverd2",
+                "ip_address": "127.0.0.2",
+                "owner": "OWNERA",
+                "domain": "domain.a",
+                "environments": [],
+                "labels": [],
+                "operating_system": "CENT OS",
+                "cluster": "CLUSTERA",
+            }
+        ]
+        serializer = ServerSerializer(data=data, many=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        response = self.client.get(self.url, format="json")
+        self.assertEqual(len(response.json()["results"]), 2)
+
+    def test_cache_is_invalidated_on_delete(self):
+        self.client.get(self.url, format="json")
+
+        self.model_instance.delete()
+
+        response = self.client.get(self.url, format="json")
+        self.assertEqual(response.json()["results"], [])
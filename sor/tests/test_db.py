@@ -0,0 +1,197 @@
+"""Test cases for sor database connection hooks
+"""
+
+import contextvars
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from sor import cache as response_cache
+from sor.db import ReplicaRouter, close_unusable_connections, primary_pinning
+from sor.middleware import PrimaryPinningMiddleware
+from sor.lookups import REFERENCE_CACHES
+from sor.models import Label, Server
+
+
+class SqliteConnectionTestCase(TestCase):
+    def get_pragmas(self, *names):
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = DatabaseWrapper(
+                {
+                    **connection.settings_dict,
+                    "NAME": os.path.join(directory, "db.sqlite3"),
+                }
+            )
+            try:
+                pragmas = {}
+                with wrapper.cursor() as cursor:
+                    for name in names:
+                        cursor.execute("PRAGMA %s" % name)
+                        pragmas[name] = cursor.fetchone()[0]
+                return pragmas
+            finally:
+                wrapper.close()
+
+    def test_sqlite_connection_pragmas(self):
+        self.assertEqual(
+            self.get_pragmas(
+                "journal_mode", "synchronous", "cache_size", "busy_timeout"
+            ),
+            {
+                "journal_mode": "wal",
+                "synchronous": 1,
+                "cache_size": -64 * 1024,
+                "busy_timeout": 20000,
+            },
+        )
+
+    def test_sqlite_connection_pragmas_are_configurable(self):
+        with self.settings(SOR_SQLITE_PRAGMAS={"synchronous": "FULL"}):
+            self.assertEqual(
+                self.get_pragmas("journal_mode", "synchronous"),
+                {"journal_mode": "delete", "synchronous": 2},
+            )
+
+
+class ConnectionHealthCheckTestCase(TestCase):
+    def test_unusable_connection_is_closed(self):
+        with mock.patch.object(
+            connection, "in_atomic_block", False
+        ), mock.patch.object(
+            connection, "is_usable", return_value=False
+        ), mock.patch.object(
+            connection, "close"
+        ) as close:
+            close_unusable_connections()
+            close.assert_not_called()
+
+            with mock.patch.dict(
+                connection.settings_dict, {"CONN_HEALTH_CHECKS": True}
+            ):
+                close_unusable_connections()
+            close.assert_called_once_with()
+
+
+class ReplicaRouterTestCase(APITestCase):
+    """Uses a second SQLite file as a stand-in for a replica
+    """
+
+    def setUp(self):
+        # Reads only go to replicas inside a pinning scope, like the one
+        # requests get
+        pinning = primary_pinning()
+        pinning.__enter__()
+        self.addCleanup(pinning.__exit__, None, None, None)
+
+        with primary_pinning():
+            self.user = User.objects.create_user(
+                "test", "test@example.com", "testpassword123"
+            )
+            Label.objects.create(name="on primary")
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.add_database("replica", os.path.join(directory.name, "replica"))
+        self.add_database("offline", os.path.join(directory.name, "no", "db"))
+        with connections["replica"].schema_editor() as editor:
+            editor.create_model(Label)
+        Label.objects.using("replica").create(name="on replica")
+
+        settings = self.settings(SOR_DATABASE_REPLICAS=["replica"])
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def add_database(self, alias, name):
+        connections.databases[alias] = {
+            **connection.settings_dict,
+            "NAME": name,
+            "TEST": {},
+        }
+
+        def remove():
+            connections[alias].close()
+            del connections.databases[alias]
+            delattr(connections._connections, alias)
+
+        self.addCleanup(remove)
+
+    def get_label_names(self):
+        return list(Label.objects.values_list("name", flat=True))
+
+    def test_reads_are_sent_to_replica(self):
+        self.assertEqual(self.get_label_names(), ["on replica"])
+
+        with primary_pinning():
+            Label.objects.create(name="written")
+            self.assertEqual(self.get_label_names(), ["on primary", "written"])
+        self.assertEqual(self.get_label_names(), ["on replica"])
+
+    def test_reads_outside_scopes_go_to_primary(self):
+        def write_outside_scopes():
+            self.assertEqual(self.get_label_names(), ["on primary"])
+            Label.objects.create(name="written")
+            with primary_pinning():
+                self.assertEqual(self.get_label_names(), ["on replica"])
+
+        contextvars.Context().run(write_outside_scopes)
+        self.assertEqual(self.get_label_names(), ["on replica"])
+
+    def test_caches_are_filled_from_primary(self):
+        reference = REFERENCE_CACHES[Label]
+        reference.invalidate()
+        self.addCleanup(reference.invalidate)
+        self.assertIsNotNone(reference.get_by_name("on primary"))
+        self.assertIsNone(reference.get_by_name("on replica"))
+
+        response_cache.get_cache().clear()
+        self.addCleanup(response_cache.get_cache().clear)
+        with mock.patch("sor.cache.is_available", return_value=True):
+            names = response_cache.get_or_set(
+                [Label], ("names",), self.get_label_names
+            )
+        self.assertEqual(names, ["on primary"])
+        self.assertEqual(self.get_label_names(), ["on replica"])
+
+    def test_reads_fall_back_to_primary(self):
+        with self.settings(SOR_DATABASE_REPLICAS=["offline"]):
+            self.assertEqual(self.get_label_names(), ["on primary"])
+
+        with self.settings(SOR_DATABASE_REPLICAS=["offline", "replica"]):
+            self.assertEqual(self.get_label_names(), ["on replica"])
+
+    def test_replicas_are_used_in_turn(self):
+        router = ReplicaRouter()
+        with self.settings(SOR_DATABASE_REPLICAS=["replica", "offline"]):
+            with mock.patch.object(router, "is_available", return_value=True):
+                self.assertEqual(
+                    [router.db_for_read(Server) for _ in range(3)],
+                    ["replica", "offline", "replica"],
+                )
+            self.assertIsNone(router.db_for_read(User))
+
+    def test_request_is_pinned_after_write(self):
+        url = reverse("label-list")
+        response = self.client.get(url, format="json")
+        self.assertEqual(
+            [label["name"] for label in response.data["results"]],
+            ["on replica"],
+        )
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(url, {"name": "written"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn(PrimaryPinningMiddleware.cookie_name, response.cookies)
+
+        response = self.client.get(url, format="json")
+        self.assertEqual(
+            [label["name"] for label in response.data["results"]],
+            ["on primary", "written"],
+        )
@@ -0,0 +1,167 @@
+"""Test cases for sor reference lookup cache
+"""
+
+from unittest import mock
+
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from sor.lookups import REFERENCE_CACHES, get_reference_cache
+from sor.models import (
+    Label,
+    Owner,
+    Cluster,
+    Environment,
+    Domain,
+    OperatingSystem,
+    Server,
+)
+from sor.resolvers import NameResolver
+from sor.serializers import LabelSerializer, ServerSerializer
+
+
+class ReferenceCacheTestCase(TransactionTestCase):
+    """Tests run outside of a transaction, where the cache is used
+    """
+
+    def setUp(self):
+        for reference in REFERENCE_CACHES.values():
+            reference.invalidate()
+
+        self.owner_instance = Owner.objects.create(
+            name="OWNERA", email="owner@example.com", description="A owner"
+        )
+        self.label_instance = Label.objects.create(name="test")
+
+    def test_cache_is_loaded_once(self):
+        reference = get_reference_cache(Owner)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                reference.get_by_name("OWNERA"), self.owner_instance
+            )
+            self.assertEqual(
+                reference.get_by_id(self.owner_instance.id),
+                self.owner_instance,
+            )
+            self.assertIsNone(reference.get_by_name("OWNERB"))
+
+    def test_cache_is_bypassed_in_transactions(self):
+        self.assertIsNotNone(get_reference_cache(Owner))
+        with transaction.atomic():
+            self.assertIsNone(get_reference_cache(Owner))
+
+    def test_cache_is_only_used_for_reference_models(self):
+        self.assertIsNone(get_reference_cache(Domain))
+        self.assertIsNone(get_reference_cache(Server))
+
+    def test_cache_is_disabled_without_ttl(self):
+        with self.settings(SOR_REFERENCE_CACHE_TTL=0):
+            self.assertIsNone(get_reference_cache(Owner))
+
+    def test_cache_is_invalidated_on_save(self):
+        reference = get_reference_cache(Owner)
+        reference.get_by_name("OWNERA")
+
+        self.owner_instance.name = "OWNERB"
+        self.owner_instance.save()
+
+        self.assertIsNone(reference.get_by_name("OWNERA"))
+        self.assertEqual(reference.get_by_name("OWNERB"), self.owner_instance)
+
+    def test_cache_is_invalidated_on_delete(self):
+        reference = get_reference_cache(Label)
+        reference.get_by_name("test")
+
+        self.label_instance.delete()
+
+        self.assertIsNone(reference.get_by_name("test"))
+
+    def test_cache_is_invalidated_on_bulk_save(self):
+        reference = get_reference_cache(Label)
+        reference.get_by_name("test")
+
+        serializer = LabelSerializer(data=[{"name": "bulk"}], many=True)
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+
+        self.assertIsNotNone(reference.get_by_name("bulk"))
+
+    def test_cache_is_reloaded_once_for_missing_ids(self):
+        reference = get_reference_cache(Owner)
+        reference.get_by_id(self.owner_instance.pk)
+        # Rows written by another process do not invalidate the cache
+        Owner.objects.bulk_create(
+            [Owner(name="OWNERB", email="ownerb@example.com")]
+        )
+        owner_id = Owner.objects.get(name="OWNERB").pk
+
+        with self.assertNumQueries(1):
+            self.assertEqual(reference.get_by_id(owner_id).name, "OWNERB")
+            self.assertEqual(reference.get_by_id(owner_id).name, "OWNERB")
+
+        with self.assertNumQueries(1):
+            self.assertIsNone(reference.get_by_id(100))
+            self.assertIsNone(reference.get_by_id(100))
+
+    def test_cache_expires_after_ttl(self):
+        reference = get_reference_cache(Label)
+        reference.get_by_name("test")
+
+        # Written without signals, as another process would
+        Label.objects.filter(name="test").update(name="renamed")
+
+        with mock.patch("sor.lookups.time.monotonic", return_value=10 ** 9):
+            self.assertIsNone(reference.get_by_name("test"))
+            self.assertIsNotNone(reference.get_by_name("renamed"))
+
+    def test_resolver_uses_cache(self):
+        get_reference_cache(Owner).get_by_name("OWNERA")
+
+        with self.assertNumQueries(0):
+            instances, missing = NameResolver().resolve(Owner, ["OWNERA"])
+        self.assertEqual(instances, [self.owner_instance])
+        self.assertEqual(missing, [])
+
+    def test_resolver_queries_names_missing_from_cache(self):
+        get_reference_cache(Owner).get_by_name("OWNERA")
+        Owner.objects.filter(pk=self.owner_instance.pk).update(name="OWNERB")
+
+        with self.assertNumQueries(1):
+            instances, missing = NameResolver().resolve(
+                Owner, ["OWNERB", "OWNERC"]
+            )
+        self.assertEqual(instances, [self.owner_instance])
+        self.assertEqual(missing, ["OWNERC"])
+
+    def test_server_representation_uses_cache(self):
+        domain_instance = Domain.objects.create(
+            name="domain.a", owner=self.owner_instance
+        )
+        cluster_instance = Cluster.objects.create(name="CLUSTERA")
+        os_instance = OperatingSystem.objects.create(
+            name="CENT OS", version="8.0"
+        )
+        environment_instance = Environment.objects.create(name="ENVA")
+        server = Server.objects.create(
+            name="testserverd1",
+            ip_address="127.0.0.1",
+            owner=self.owner_instance,
+            domain=domain_instance,
+            cluster=cluster_instance,
+            operating_system=os_instance,
+        )
+        server.environments.add(environment_instance)
+
+        for model in (Owner, Cluster, OperatingSystem):
+            get_reference_cache(model).get_by_id(1)
+
+        queryset = ServerSerializer.setup_eager_loading(Server.objects.all())
+        # Servers with their domains, then environments and labels
+        with self.assertNumQueries(3):
+            data = ServerSerializer(queryset, many=True).data
+
+        self.assertEqual(data[0]["owner"], "OWNERA")
+        self.assertEqual(data[0]["cluster"], "CLUSTERA")
+        self.assertEqual(data[0]["operating_system"], "CENT OS")
+        self.assertEqual(data[0]["environments"], ["ENVA"])
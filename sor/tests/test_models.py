@@ -336,6 +336,90 @@ class ServerModelTestCase(TestCase):
         with self.assertRaises(ObjectDoesNotExist):
             Server.objects.get(name="testserverd1")
 
+    def test_server_fqdn(self):
+        """Test server fqdn is annotated without loading the domain
+        """
+        self.assertEqual(self.model_instance.fqdn, "testserverd1.domain.a")
+
+        with self.assertNumQueries(1):
+            servers = list(Server.objects.with_fqdn())
+            self.assertEqual(
+                [server.fqdn for server in servers], ["testserverd1.domain.a"]
+            )
+
+        server = Server.objects.with_fqdn().get(fqdn="testserverd1.domain.a")
+        server.name = "testserverd1_updated"
+        server.save()
+        self.assertEqual(server.fqdn, "testserverd1_updated.domain.a")
+
+    def test_server_query_builders(self):
+        """Test server query builders can be chained
+        """
+        b_server = Server.objects.create(
+            name="testserverd2",
+            ip_address="127.0.0.2",
+            category="WEB",
+            owner=self.owner_instance,
+            domain=self.domain_instance,
+            operating_system=self.os_instance,
+            status="ACTIVE",
+        )
+        b_server.environments.add(self.env_instance)
+
+        def names(queryset):
+            return [server.name for server in queryset.order_by("id")]
+
+        self.assertEqual(names(Server.objects.active()), ["testserverd2"])
+        self.assertEqual(
+            names(Server.objects.in_environment("ENVA")),
+            ["testserverd1", "testserverd2"],
+        )
+        self.assertEqual(
+            names(Server.objects.in_environment("ENVA").active()),
+            ["testserverd2"],
+        )
+        self.assertEqual(
+            names(Server.objects.with_label("test")), ["testserverd1"]
+        )
+        self.assertEqual(
+            names(Server.objects.by_cluster("CLUSTERA")), ["testserverd1"]
+        )
+
+        with self.assertNumQueries(3):
+            servers = list(Server.objects.with_relations().order_by("id"))
+            self.assertEqual(servers[0].domain.name, "domain.a")
+            self.assertEqual(servers[0].cluster.name, "CLUSTERA")
+            self.assertEqual(
+                [label.name for label in servers[0].labels.all()], ["test"]
+            )
+            self.assertEqual(
+                [env.name for env in servers[1].environments.all()], ["ENVA"]
+            )
+
+    def test_server_counts_by(self):
+        """Test servers are counted by field value
+        """
+        Server.objects.create(
+            name="testserverd2",
+            ip_address="127.0.0.2",
+            category="WEB",
+            owner=self.owner_instance,
+            domain=self.domain_instance,
+            operating_system=self.os_instance,
+        )
+
+        self.assertEqual(
+            list(Server.objects.counts_by("category")),
+            [{"category": "APP", "count": 1}, {"category": "WEB", "count": 1}],
+        )
+        self.assertEqual(
+            list(Server.objects.counts_by("environments__name")),
+            [
+                {"environments__name": None, "count": 1},
+                {"environments__name": "ENVA", "count": 1},
+            ],
+        )
+
 
 class ProductModelTestCase(TestCase):
     @classmethod
@@ -0,0 +1,60 @@
+"""Test cases for sor synthetic data
+"""
+
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.test import TestCase
+
+from sor.models import Label, Server, Product
+from sor.seed import SeedError, seed_sor
+
+
+class SeedTestCase(TestCase):
+    def seed_servers(self, **kwargs):
+        with transaction.atomic():
+            seed_sor(100, seed=1, **kwargs)
+            servers = list(
+                Server.objects.order_by("name", "environments").values_list(
+                    "name",
+                    "ip_address",
+                    "owner__name",
+                    "cluster__name",
+                    "environments__name",
+                )
+            )
+            transaction.set_rollback(True)
+        return servers
+
+    def test_seed_is_deterministic(self):
+        servers = self.seed_servers()
+        self.assertEqual(len({server[0] for server in servers}), 100)
+        self.assertEqual(len({server[1] for server in servers}), 100)
+        self.assertEqual(self.seed_servers(chunk_size=7), servers)
+        self.assertFalse(Server.objects.exists())
+
+    def test_seed_creates_relations(self):
+        seed_sor(100)
+        self.assertEqual(Product.objects.count(), 5)
+        self.assertEqual(Server.environments.through.objects.count(), 150)
+        self.assertEqual(Server.labels.through.objects.count(), 150)
+        self.assertEqual(
+            Label.objects.get(name="label0").servers.count(),
+            Server.objects.filter(labels__name="label0").count(),
+        )
+
+    def test_seed_requires_empty_database(self):
+        seed_sor(10)
+        with self.assertRaises(SeedError):
+            seed_sor(10)
+        self.assertEqual(Server.objects.count(), 10)
+
+    def test_seed_command(self):
+        out = StringIO()
+        call_command("seed_sor", servers=20, stdout=out)
+        self.assertIn("Seeded 20 servers", out.getvalue())
+        self.assertEqual(Server.objects.count(), 20)
+
+        with self.assertRaises(CommandError):
+            call_command("seed_sor", servers=0, stdout=out)
@@ -321,6 +321,7 @@ class ServerSerializerTestCase(TestCase):
                 [
                     "id",
                     "name",
+                    "fqdn",
                     "ip_address",
                     "category",
                     "owner",
@@ -342,6 +343,7 @@ class ServerSerializerTestCase(TestCase):
             "description": "A test server",
             "domain": "domain.a",
             "environments": ["ENVA"],
+            "fqdn": "testserverd1.domain.a",
             "id": 1,
             "ip_address": "127.0.0.1",
             "labels": ["test"],
@@ -376,6 +378,43 @@ class ServerSerializerTestCase(TestCase):
         self.assertFalse(serializer.is_valid())
         self.assertNotEqual(serializer.data, data)
 
+    def test_server_serializer_reports_every_missing_name(self):
+        data = {
+            "cluster": "CLUSTERA",
+            "domain": "domain.a",
+            "environments": ["ENVA", "ENVX"],
+            "ip_address": "127.0.0.2",
+            "labels": ["test", "missing1", "missing2"],
+            "name": "testserverd2",
+            "operating_system": "CENT OS",
+            "owner": "OWNERX",
+        }
+        serializer = ServerSerializer(data=data)
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(len(serializer.errors["labels"]), 2)
+        self.assertEqual(len(serializer.errors["environments"]), 1)
+        self.assertEqual(len(serializer.errors["owner"]), 1)
+
+    def test_server_serializer_resolves_names_once_per_model(self):
+        Label.objects.create(name="test2")
+        Label.objects.create(name="test3")
+        data = {
+            "cluster": "CLUSTERA",
+            "domain": "domain.a",
+            "environments": ["ENVA"],
+            "ip_address": "127.0.0.2",
+            "labels": ["test", "test2", "test3"],
+            "name": "testserverd2",
+            "operating_system": "CENT OS",
+            "owner": "OWNERA",
+        }
+        serializer = ServerSerializer(data=data)
+
+        # One query per related model plus the name and ip unique checks
+        with self.assertNumQueries(8):
+            self.assertTrue(serializer.is_valid())
+        self.assertEqual(len(serializer.validated_data["labels"]), 3)
+
 
 class ProductSerializerTestCase(TestCase):
     @classmethod
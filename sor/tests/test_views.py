@@ -1,7 +1,17 @@
 """Test cases for sor views
 """
 
+import base64
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -16,6 +26,7 @@ from sor.models import (
     Server,
     Product,
 )
+from sor.pagination import SorCursorPagination
 
 
 class LabelViewTestCase(APITestCase):
@@ -68,6 +79,117 @@ class LabelViewTestCase(APITestCase):
         response = self.client.delete(f"{self.url}100/", format="json")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_get_labels_paginated(self):
+        Label.objects.create(name="test 2")
+        Label.objects.create(name="test 3")
+
+        response = self.client.get(self.url, {"page_size": 2}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [label["name"] for label in response.data["results"]],
+            ["test", "test 2"],
+        )
+        self.assertIsNone(response.data["previous"])
+
+        response = self.client.get(response.data["next"], format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [label["name"] for label in response.data["results"]], ["test 3"]
+        )
+        self.assertIsNone(response.data["next"])
+
+    @override_settings(SOR_CHANGES_SAFETY_SECONDS=0)
+    def test_get_label_changes(self):
+        changes_url = reverse("label-changes")
+        response = self.client.get(changes_url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [label["name"] for label in response.data["changed"]], ["test"]
+        )
+        self.assertEqual(response.data["deleted"], [])
+        self.assertFalse(response.data["has_more"])
+
+        cursor = response.data["next"]
+        response = self.client.get(changes_url, {"since": cursor})
+        self.assertEqual(response.data["changed"], [])
+
+        other_id = Label.objects.create(name="test 2").id
+        self.model_instance.name = "test updated"
+        self.model_instance.save()
+        Label.objects.filter(id=other_id).delete()
+
+        response = self.client.get(changes_url, {"since": cursor})
+        self.assertEqual(
+            [label["name"] for label in response.data["changed"]],
+            ["test updated"],
+        )
+        self.assertEqual(
+            [label["id"] for label in response.data["deleted"]], [other_id]
+        )
+
+        cursor = response.data["next"]
+        response = self.client.get(changes_url, {"since": cursor})
+        self.assertEqual(response.data["changed"], [])
+        self.assertEqual(response.data["deleted"], [])
+
+    @override_settings(SOR_CHANGES_SAFETY_SECONDS=0)
+    def test_get_label_changes_in_pages(self):
+        Label.objects.create(name="test 2")
+        Label.objects.create(name="test 3")
+        changes_url = reverse("label-changes")
+
+        names = []
+        params = {"page_size": 2}
+        while True:
+            response = self.client.get(changes_url, params, format="json")
+            names.extend(label["name"] for label in response.data["changed"])
+            if not response.data["has_more"]:
+                break
+            params["since"] = response.data["next"]
+
+        self.assertEqual(names, ["test", "test 2", "test 3"])
+
+    def test_get_label_changes_invalid_cursor(self):
+        response = self.client.get(
+            reverse("label-changes"), {"since": "invalid"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        since = {"updated_at": "invalid", "id": 0, "deleted": 0}
+        cursor = base64.urlsafe_b64encode(json.dumps(since).encode())
+        response = self.client.get(
+            reverse("label-changes"), {"since": cursor.decode()}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_label_changes_holds_back_recent_changes(self):
+        changes_url = reverse("label-changes")
+        response = self.client.get(changes_url, format="json")
+        self.assertEqual(response.data["changed"], [])
+
+        cursor = response.data["next"]
+        self.model_instance.delete()
+        response = self.client.get(changes_url, {"since": cursor})
+        self.assertEqual(response.data["deleted"], [])
+
+        settled = timezone.now() + timedelta(
+            seconds=settings.SOR_CHANGES_SAFETY_SECONDS
+        )
+        with mock.patch("django.utils.timezone.now", return_value=settled):
+            response = self.client.get(changes_url, {"since": cursor})
+        self.assertEqual(len(response.data["deleted"]), 1)
+
+    def test_get_labels_page_size_is_capped(self):
+        Label.objects.create(name="test 2")
+        Label.objects.create(name="test 3")
+
+        with mock.patch.object(SorCursorPagination, "max_page_size", 2):
+            response = self.client.get(
+                self.url, {"page_size": 100}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+
 
 class OwnerViewTestCase(APITestCase):
     @classmethod
@@ -132,6 +254,23 @@ class OwnerViewTestCase(APITestCase):
         response = self.client.delete(f"{self.url}100/", format="json")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_bulk_remove_referenced_owners(self):
+        owner = Owner.objects.create(name="test 2", email="test2@example.com")
+        Domain.objects.create(name="domain.a", owner=self.model_instance)
+        data = [owner.id, self.model_instance.id]
+        response = self.client.delete(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("id", response.data[1])
+        self.assertEqual(Owner.objects.filter(id__in=data).count(), 2)
+
+    def test_bulk_remove_owners_with_boolean_ids(self):
+        response = self.client.delete(self.url, [True], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(
+            Owner.objects.filter(id=self.model_instance.id).exists()
+        )
+
 
 class ClusterViewTestCase(APITestCase):
     @classmethod
@@ -547,6 +686,501 @@ class ServerViewTestCase(APITestCase):
         response = self.client.delete(f"{self.url}100/", format="json")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def get_bulk_server_data(self, count):
+        return [
+            {
+                "category": "APP",
+                "cluster": "CLUSTERA",
+                "description": "A bulk server",
+                "domain": "domain.a",
+                "environments": ["ENVA"],
+                "ip_address": f"10.0.0.{index}",
+                "labels": ["test"],
+                "name": f"bulkserver{index}",
+                "operating_system": "CENT OS",
+                "owner": "OWNERA",
+                "status": "ACTIVE",
+            }
+            for index in range(count)
+        ]
+
+    def test_bulk_create_servers(self):
+        data = self.get_bulk_server_data(10)
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 10)
+        self.assertEqual(
+            Server.objects.filter(name__startswith="bulkserver").count(), 10
+        )
+        server = Server.objects.get(name="bulkserver3")
+        self.assertEqual(server.owner, self.owner_instance)
+        self.assertEqual(list(server.labels.all()), [self.label_instance])
+        self.assertEqual(list(server.environments.all()), [self.env_instance])
+
+    def test_bulk_create_servers_batches_related_queries(self):
+        with CaptureQueriesContext(connection) as few:
+            self.client.post(
+                self.url, self.get_bulk_server_data(2), format="json"
+            )
+        Server.objects.filter(name__startswith="bulkserver").delete()
+
+        with CaptureQueriesContext(connection) as many:
+            self.client.post(
+                self.url, self.get_bulk_server_data(20), format="json"
+            )
+
+        # Only the unique validators of name and ip_address run per item
+        self.assertEqual(len(many) - len(few), 18 * 2)
+
+    def test_bulk_create_servers_reports_item_errors(self):
+        data = self.get_bulk_server_data(3)
+        data[1]["owner"] = "UNKNOWN"
+        data[2]["name"] = data[0]["name"]
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("owner", response.data[1])
+        self.assertFalse(
+            Server.objects.filter(name__startswith="bulkserver").exists()
+        )
+
+        data[1]["owner"] = "OWNERA"
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("name", response.data[2])
+
+    def test_bulk_update_servers(self):
+        label = Label.objects.create(name="bulk")
+        data = [
+            {
+                "id": self.model_instance.id,
+                "status": "ACTIVE",
+                "labels": ["bulk"],
+            }
+        ]
+        response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.model_instance.refresh_from_db()
+        self.assertEqual(self.model_instance.status, "ACTIVE")
+        self.assertEqual(list(self.model_instance.labels.all()), [label])
+        self.assertEqual(
+            list(self.model_instance.environments.all()), [self.env_instance]
+        )
+
+    def test_bulk_update_unknown_server(self):
+        data = [{"id": 100, "status": "ACTIVE"}]
+        response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("id", response.data[0])
+
+    def test_bulk_update_server_with_invalid_ids(self):
+        data = [
+            {"id": True, "description": "Updated"},
+            {"id": "1", "description": "Updated"},
+            {"description": "Updated"},
+        ]
+        response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        for errors in response.data:
+            self.assertIn("id", errors)
+        self.model_instance.refresh_from_db()
+        self.assertEqual(self.model_instance.description, "A test server")
+
+    def test_bulk_update_duplicate_server(self):
+        data = [
+            {"id": self.model_instance.id, "status": "ACTIVE"},
+            {"id": self.model_instance.id, "labels": []},
+        ]
+        response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("id", response.data[1])
+
+    def test_bulk_remove_servers(self):
+        response = self.client.post(
+            self.url, self.get_bulk_server_data(3), format="json"
+        )
+        ids = [server["id"] for server in response.data]
+        response = self.client.delete(self.url, ids, format="json")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Server.objects.filter(id__in=ids).exists())
+
+    def test_bulk_remove_invalid_servers(self):
+        data = [self.model_instance.id, 100]
+        response = self.client.delete(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(
+            Server.objects.filter(id=self.model_instance.id).exists()
+        )
+
+    def test_filter_servers(self):
+        prod_instance = Environment.objects.create(
+            name="ENVP", category="PROD", description="Environment P"
+        )
+        server = Server.objects.create(
+            name="testserverd2",
+            ip_address="10.0.0.2",
+            category="WEB",
+            owner=self.owner_instance,
+            domain=self.domain_instance,
+            operating_system=self.os_instance,
+            status="ACTIVE",
+        )
+        server.environments.add(prod_instance, self.env_instance)
+
+        filters = [
+            {"status": "ACTIVE"},
+            {"category": "WEB"},
+            {"environment": "ENVP"},
+            {"environment_category": "PROD"},
+            {"ip_prefix": "10.0."},
+            {"status": "ACTIVE", "category": "WEB", "owner": "OWNERA"},
+        ]
+        for params in filters:
+            response = self.client.get(self.url, params, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                [item["name"] for item in response.data["results"]],
+                ["testserverd2"],
+                params,
+            )
+
+        response = self.client.get(
+            self.url, {"environment": "ENVA"}, format="json"
+        )
+        self.assertEqual(len(response.data["results"]), 2)
+
+        response = self.client.get(self.url, {"label": "test"}, format="json")
+        self.assertEqual(
+            [item["name"] for item in response.data["results"]],
+            ["testserverd1"],
+        )
+
+    def test_search_and_order_servers(self):
+        Server.objects.create(
+            name="testserverd2",
+            ip_address="127.0.0.2",
+            owner=self.owner_instance,
+            domain=self.domain_instance,
+            operating_system=self.os_instance,
+        )
+
+        response = self.client.get(self.url, {"search": "d2"}, format="json")
+        self.assertEqual(
+            [item["name"] for item in response.data["results"]],
+            ["testserverd2"],
+        )
+
+        response = self.client.get(
+            self.url, {"ordering": "-name"}, format="json"
+        )
+        self.assertEqual(
+            [item["name"] for item in response.data["results"]],
+            ["testserverd2", "testserverd1"],
+        )
+
+    def test_page_through_servers_ordered_by_status(self):
+        for index in range(2, 8):
+            Server.objects.create(
+                name="testserverd%d" % index,
+                ip_address="127.0.0.%d" % index,
+                owner=self.owner_instance,
+                domain=self.domain_instance,
+                operating_system=self.os_instance,
+                status="ACTIVE" if index % 3 else "INACTIVE",
+            )
+        names = list(
+            Server.objects.order_by("-status", "-id").values_list(
+                "name", flat=True
+            )
+        )
+
+        pages = []
+        url = self.url
+        params = {"ordering": "-status", "page_size": 2}
+        while url:
+            response = self.client.get(url, params, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append([item["name"] for item in response.data["results"]])
+            url, params = response.data["next"], None
+        self.assertEqual(sum(pages, []), names)
+
+        previous = response.data["previous"]
+        response = self.client.get(previous, format="json")
+        self.assertEqual(
+            [item["name"] for item in response.data["results"]], pages[-2]
+        )
+
+    def test_get_servers_invalid_cursor(self):
+        response = self.client.get(
+            self.url, {"cursor": "cD1bImFiYyJd"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_filter_and_order_servers_by_fqdn(self):
+        Server.objects.create(
+            name="testserverd2",
+            ip_address="127.0.0.2",
+            owner=self.owner_instance,
+            domain=Domain.objects.create(
+                name="domain.b", owner=self.owner_instance
+            ),
+            operating_system=self.os_instance,
+        )
+
+        response = self.client.get(
+            self.url, {"fqdn": "testserverd2.domain.b"}, format="json"
+        )
+        self.assertEqual(
+            [item["fqdn"] for item in response.data["results"]],
+            ["testserverd2.domain.b"],
+        )
+
+        response = self.client.get(
+            self.url, {"ordering": "-fqdn"}, format="json"
+        )
+        self.assertEqual(
+            [item["fqdn"] for item in response.data["results"]],
+            ["testserverd2.domain.b", "testserverd1.domain.a"],
+        )
+
+    def test_get_servers_not_modified(self):
+        response = self.client.get(self.url, format="json")
+        etag = response["ETag"]
+
+        # Validators come from the version tokens of the SOR cache
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.url, format="json", HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(
+            self.url, {"status": "ACTIVE"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_servers_modified_by_related_change(self):
+        response = self.client.get(self.url, format="json")
+        etag = response["ETag"]
+
+        self.owner_instance.name = "OWNERB"
+        self.owner_instance.save()
+
+        response = self.client.get(
+            self.url, format="json", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["results"][0]["owner"], "OWNERB")
+
+    def test_get_servers_modified_by_delete(self):
+        Server.objects.create(
+            name="testserverd2",
+            ip_address="127.0.0.2",
+            owner=self.owner_instance,
+            domain=self.domain_instance,
+            operating_system=self.os_instance,
+        )
+        response = self.client.get(self.url, format="json")
+        etag = response["ETag"]
+
+        self.client.delete(f"{self.url}1/", format="json")
+
+        response = self.client.get(
+            self.url, format="json", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_server_not_modified(self):
+        response = self.client.get(f"{self.url}1/", format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Last-Modified", response)
+
+        # The row's updated_at is the only query
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f"{self.url}1/",
+                format="json",
+                HTTP_IF_NONE_MATCH=response["ETag"],
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(
+            f"{self.url}1/",
+            format="json",
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_invalid_server(self):
+        response = self.client.get(f"{self.url}100/", format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_server_malformed_id(self):
+        response = self.client.get(f"{self.url}abc/", format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_servers_sparse_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                self.url, {"fields": "name,ip_address"}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"],
+            [{"name": "testserverd1", "ip_address": "127.0.0.1"}],
+        )
+        sql = " ".join(query["sql"] for query in queries)
+        self.assertNotIn("sor_label", sql)
+        self.assertNotIn('"sor_domain"."owner_id"', sql)
+        self.assertNotIn('"sor_server"."description"', sql)
+
+    def test_get_servers_omit_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                self.url, {"omit": "labels,description"}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        server = response.data["results"][0]
+        self.assertNotIn("labels", server)
+        self.assertNotIn("description", server)
+        self.assertEqual(server["environments"], ["ENVA"])
+        sql = " ".join(query["sql"] for query in queries)
+        self.assertNotIn("sor_label", sql)
+
+    def test_get_servers_compact(self):
+        response = self.client.get(
+            self.url, {"compact": "true"}, format="json"
+        )
+        self.assertEqual(
+            set(response.data["results"][0]),
+            {"id", "name", "ip_address", "status"},
+        )
+
+    def test_get_server_sparse_fields(self):
+        response = self.client.get(
+            f"{self.url}1/", {"fields": "name,labels"}, format="json"
+        )
+        self.assertEqual(
+            response.data, {"name": "testserverd1", "labels": ["test"]}
+        )
+
+    def test_export_servers_ndjson(self):
+        for index in range(2, 5):
+            Server.objects.create(
+                name=f"testserverd{index}",
+                ip_address=f"127.0.0.{index}",
+                owner=self.owner_instance,
+                domain=self.domain_instance,
+                operating_system=self.os_instance,
+                status="ACTIVE",
+            )
+        export_url = reverse("server-export")
+
+        with mock.patch("sor.views.ServerView.export_chunk_size", 2):
+            response = self.client.get(export_url, {"format": "ndjson"})
+            lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response["Content-Type"], "application/x-ndjson; charset=utf-8"
+        )
+        servers = [json.loads(line) for line in lines]
+        self.assertEqual(
+            [server["name"] for server in servers],
+            [f"testserverd{index}" for index in range(1, 5)],
+        )
+        self.assertEqual(servers[0]["labels"], ["test"])
+        self.assertEqual(servers[0]["environments"], ["ENVA"])
+
+        response = self.client.get(
+            export_url, {"format": "ndjson", "status": "ACTIVE"}
+        )
+        lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual(len(lines), 3)
+
+    def test_get_server_inventory(self):
+        Server.objects.create(
+            name="testserverd2",
+            ip_address="127.0.0.2",
+            category="WEB",
+            owner=self.owner_instance,
+            domain=self.domain_instance,
+            operating_system=self.os_instance,
+            status="ACTIVE",
+        )
+        inventory_url = reverse("server-inventory")
+
+        with self.assertNumQueries(3):
+            response = self.client.get(inventory_url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        inventory = response.data
+        self.assertEqual(
+            inventory["all"]["hosts"],
+            ["testserverd1.domain.a", "testserverd2.domain.a"],
+        )
+        self.assertEqual(
+            inventory["_meta"]["hostvars"]["testserverd1.domain.a"],
+            {
+                "ansible_host": "127.0.0.1",
+                "sor_id": self.model_instance.id,
+                "sor_status": "INACTIVE",
+            },
+        )
+        expected = {
+            "category_app": ["testserverd1.domain.a"],
+            "category_web": ["testserverd2.domain.a"],
+            "cluster_clustera": ["testserverd1.domain.a"],
+            "env_enva": ["testserverd1.domain.a"],
+            "label_test": ["testserverd1.domain.a"],
+            "os_cent_os": ["testserverd1.domain.a", "testserverd2.domain.a"],
+        }
+        for group, hosts in expected.items():
+            self.assertEqual(inventory[group], {"hosts": hosts}, group)
+        self.assertEqual(inventory["all"]["children"], sorted(expected))
+
+        response = self.client.get(
+            inventory_url, {"status": "ACTIVE"}, format="json"
+        )
+        self.assertEqual(
+            response.data["all"]["hosts"], ["testserverd2.domain.a"]
+        )
+        self.assertNotIn("label_test", response.data)
+
+    def test_export_servers_json(self):
+        response = self.client.get(
+            reverse("server-export"), {"format": "json", "fields": "name"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            json.loads(b"".join(response.streaming_content)),
+            [{"name": "testserverd1"}],
+        )
+
+    def test_get_servers_query_count_is_constant(self):
+        with CaptureQueriesContext(connection) as single:
+            self.client.get(self.url, format="json")
+
+        for index in range(2, 7):
+            server = Server.objects.create(
+                name=f"testserverd{index}",
+                ip_address=f"127.0.0.{index}",
+                owner=self.owner_instance,
+                domain=self.domain_instance,
+                cluster=self.cluster_instance,
+                operating_system=self.os_instance,
+            )
+            server.environments.add(self.env_instance)
+            server.labels.add(self.label_instance)
+
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url, format="json")
+
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertEqual(len(single), len(many))
+
 
 class ProductViewTestCase(APITestCase):
     @classmethod
@@ -634,3 +1268,56 @@ class ProductViewTestCase(APITestCase):
     def test_remove_invalid_product(self):
         response = self.client.delete(f"{self.url}100/", format="json")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class StatsViewTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.url = reverse("stats")
+        owner_instance = Owner.objects.create(
+            name="OWNERA", email="owner@example.com", description="A owner"
+        )
+        domain_instance = Domain.objects.create(
+            name="domain.a", owner=owner_instance
+        )
+        os_instance = OperatingSystem.objects.create(
+            name="CENT OS", family="LINUX", version="8.0"
+        )
+        env_instance = Environment.objects.create(name="ENVA")
+        for index, status_value in enumerate(["ACTIVE", "ACTIVE", "DECOM"]):
+            server = Server.objects.create(
+                name=f"testserverd{index}",
+                ip_address=f"127.0.0.{index}",
+                owner=owner_instance,
+                domain=domain_instance,
+                operating_system=os_instance,
+                status=status_value,
+            )
+            if status_value == "ACTIVE":
+                server.environments.add(env_instance)
+
+    def test_get_stats(self):
+        with self.assertNumQueries(13):
+            response = self.client.get(self.url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        servers = response.data["servers"]
+        self.assertEqual(servers["total"], 3)
+        self.assertEqual(servers["by_status"], {"ACTIVE": 2, "DECOM": 1})
+        self.assertEqual(servers["by_category"], {"WEB": 3})
+        self.assertEqual(servers["by_environment"], {"ENVA": 2})
+        self.assertEqual(servers["by_os_family"], {"LINUX": 3})
+        self.assertEqual(servers["by_owner"], {"OWNERA": 3})
+        self.assertEqual(servers["by_cluster"], {})
+        self.assertEqual(
+            response.data["totals"],
+            {
+                "labels": 0,
+                "owners": 1,
+                "clusters": 0,
+                "environments": 1,
+                "domains": 1,
+                "operating_systems": 1,
+                "servers": 3,
+                "products": 0,
+            },
+        )
@@ -2,8 +2,8 @@
 """
 
 from django.urls import include, path
-from rest_framework.routers import DefaultRouter
 
+from sor.routers import BulkRouter
 from sor.views import (
     LabelView,
     OwnerView,
@@ -13,9 +13,10 @@ from sor.views import (
     OperatingSystemView,
     ServerView,
     ProductView,
+    StatsView,
 )
 
-ROUTER = DefaultRouter()
+ROUTER = BulkRouter()
 ROUTER.register(r"labels", LabelView)
 ROUTER.register(r"owners", OwnerView)
 ROUTER.register(r"clusters", ClusterView)
@@ -25,4 +26,7 @@ ROUTER.register(r"operating_systems", OperatingSystemView)
 ROUTER.register(r"servers", ServerView)
 ROUTER.register(r"products", ProductView)
 
-urlpatterns = [path("", include(ROUTER.urls))]
+urlpatterns = [
+    path("stats/", StatsView.as_view(), name="stats"),
+    path("", include(ROUTER.urls)),
+]
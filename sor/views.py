@@ -1,9 +1,24 @@
 """Views for SOR api app
 """
 
+from django.conf import settings
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
-
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from sor import cache as response_cache
+from sor.filters import DomainFilter, ServerFilter, ProductFilter
+from sor.inventory import INVENTORY_MODELS, build_inventory
+from sor.mixins import (
+    BulkModelMixin,
+    ChangesFeedMixin,
+    ConditionalGetMixin,
+    EagerLoadingMixin,
+    ExportMixin,
+    ResponseCacheMixin,
+)
 from sor.models import (
     Label,
     Owner,
@@ -24,75 +39,154 @@ from sor.serializers import (
     ServerSerializer,
     ProductSerializer,
 )
+from sor.stats import STATS_MODELS, build_stats
+
+
+class SorModelViewSet(
+    ExportMixin,
+    ChangesFeedMixin,
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    BulkModelMixin,
+    EagerLoadingMixin,
+    viewsets.ModelViewSet,
+):
+    """Base rest view for SOR resources
+    """
 
 
-class LabelView(viewsets.ModelViewSet):
+class LabelView(SorModelViewSet):
     """Rest view for Labels
     """
 
     queryset = Label.objects.all()
     serializer_class = LabelSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    search_fields = ["name"]
+    ordering_fields = ["id", "name", "updated_at"]
+    ordering = ["id"]
 
 
-class OwnerView(viewsets.ModelViewSet):
+class OwnerView(SorModelViewSet):
     """Rest view for Owners
     """
 
     queryset = Owner.objects.all()
     serializer_class = OwnerSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    search_fields = ["name", "email", "description"]
+    ordering_fields = ["id", "name", "updated_at"]
+    ordering = ["id"]
 
 
-class ClusterView(viewsets.ModelViewSet):
+class ClusterView(SorModelViewSet):
     """Rest view for Clusters
     """
 
     queryset = Cluster.objects.all()
     serializer_class = ClusterSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    search_fields = ["name", "description"]
+    ordering_fields = ["id", "name", "updated_at"]
+    ordering = ["id"]
 
 
-class EnvironmentView(viewsets.ModelViewSet):
+class EnvironmentView(SorModelViewSet):
     """Rest view for Environment
     """
 
     queryset = Environment.objects.all()
     serializer_class = EnvironmentSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    filterset_fields = ["category"]
+    search_fields = ["name", "description"]
+    ordering_fields = ["id", "name", "category", "updated_at"]
+    ordering = ["id"]
 
 
-class DomainView(viewsets.ModelViewSet):
+class DomainView(SorModelViewSet):
     """Rest view for Domain
     """
 
     queryset = Domain.objects.all()
     serializer_class = DomainSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    filterset_class = DomainFilter
+    search_fields = ["name", "location", "description"]
+    ordering_fields = ["id", "name", "status", "updated_at"]
+    ordering = ["id"]
 
 
-class OperatingSystemView(viewsets.ModelViewSet):
+class OperatingSystemView(SorModelViewSet):
     """Rest view for OperatingSystem
     """
 
     queryset = OperatingSystem.objects.all()
     serializer_class = OperatingSystemSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    filterset_fields = ["family", "architecture", "version"]
+    search_fields = ["name", "version"]
+    ordering_fields = ["id", "name", "version", "updated_at"]
+    ordering = ["id"]
 
 
-class ServerView(viewsets.ModelViewSet):
+class ServerView(SorModelViewSet):
     """Rest view for Server
     """
 
-    queryset = Server.objects.all()
+    queryset = Server.objects.with_fqdn()
     serializer_class = ServerSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
-
-
-class ProductView(viewsets.ModelViewSet):
+    filterset_class = ServerFilter
+    search_fields = ["name", "ip_address", "description"]
+    ordering_fields = [
+        "id",
+        "name",
+        "fqdn",
+        "ip_address",
+        "status",
+        "category",
+        "updated_at",
+    ]
+    ordering = ["id"]
+
+    @action(detail=False, methods=["get"])
+    def inventory(self, request, *args, **kwargs):
+        """Ansible dynamic inventory of the filtered servers
+        """
+        inventory = response_cache.get_or_set(
+            INVENTORY_MODELS,
+            ("inventory", request.build_absolute_uri()),
+            lambda: build_inventory(self.filter_queryset(self.get_queryset())),
+        )
+        return Response(inventory)
+
+
+class ProductView(SorModelViewSet):
     """Rest view for Product
     """
 
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    filterset_class = ProductFilter
+    search_fields = ["name", "repository"]
+    ordering_fields = ["id", "name", "version", "updated_at"]
+    ordering = ["id"]
+
+
+class StatsView(APIView):
+    """Rest view for resource counts, computed in the database and cached
+    for ``SOR_STATS_CACHE_TIMEOUT`` seconds at most
+    """
+
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get(self, request, *args, **kwargs):
+        stats = response_cache.get_or_set(
+            STATS_MODELS,
+            ("stats",),
+            build_stats,
+            timeout=settings.SOR_STATS_CACHE_TIMEOUT,
+        )
+        return Response(stats)